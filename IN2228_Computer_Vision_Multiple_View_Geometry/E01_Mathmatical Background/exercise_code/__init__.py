@@ -1,5 +1,6 @@
-from .gaussian_elemination import perform_gaussian_elemination
-from .meeting_point import  meeting_point_linear
+from .gaussian_elemination import perform_gaussian_elemination, perform_gaussian_elemination_batched, GaussianFactorization
+from .meeting_point import  meeting_point_linear, MeetingPointTracker
 from .null_space import get_null_vector
 
 from .pseudo_inverse import *
+from .streaming_least_squares import StreamingLeastSquares
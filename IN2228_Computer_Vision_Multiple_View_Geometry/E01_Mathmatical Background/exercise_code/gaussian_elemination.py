@@ -127,3 +127,148 @@ def perform_gaussian_elemination(A):
     ########################################################################
     #                           END OF YOUR CODE                           #
     ########################################################################
+
+
+## Compact record of one elementary operation, used for the batched op log.
+## op is b"S", b"M" or b"A"; j is -1 for "M" operations.
+OPS_DTYPE = np.dtype([("op", "S1"), ("i", np.int32), ("j", np.int32), ("scalar", np.float64)])
+
+def perform_gaussian_elemination_batched(A, return_ops=False, tol=1e-10):
+    '''
+    Inputs:
+    - A: numpy.ndarray, stack of matrices of shape (B, dim, dim)
+    - return_ops: bool, whether to record the elementary operations
+    - tol: float, pivots with an absolute value below tol are treated as zero
+
+    Outputs:
+    - ops: numpy.ndarray of dtype OPS_DTYPE and shape (B, dim*(dim+1)), or None
+      if return_ops is False. For every column i the log holds one "S" (a no-op
+      if both indices are i), one "M" and dim-1 "A" operations, in this order.
+      The log of a degenerate matrix is meaningless.
+    - A_inv: numpy.ndarray, inverses of A of shape (B, dim, dim), NaN for
+      degenerate matrices
+    - degenerate: numpy.ndarray, boolean flags of shape (B,)
+    '''
+    A = np.asarray(A, dtype=np.float64)
+    B, dim = A.shape[0], A.shape[1]
+    batch = np.arange(B)
+    identity = np.eye(dim)
+
+    A_aug = np.concatenate((A.copy(), np.broadcast_to(identity, A.shape)), axis=2)
+    degenerate = np.zeros(B, dtype=bool)
+
+    ops = None
+    if return_ops:
+        ops = np.zeros((B, dim, dim + 1), dtype=OPS_DTYPE)
+
+    for i in range(dim):
+        ## Partial pivoting for the whole batch at once
+        max_row = i + np.argmax(np.abs(A_aug[:, i:, i]), axis=1)
+        pivot = A_aug[batch, max_row, i]
+        singular = np.abs(pivot) < tol
+        degenerate |= singular
+
+        ## Swap rows i and max_row (a no-op where max_row == i)
+        row_i = A_aug[:, i].copy()
+        A_aug[:, i] = A_aug[batch, max_row]
+        A_aug[batch, max_row] = row_i
+
+        ## Scale the pivot row, leaving degenerate matrices untouched
+        scale = 1.0 / np.where(singular, 1.0, pivot)
+        A_aug[:, i] *= scale[:, None]
+
+        ## Eliminate all other rows in one broadcast update
+        factor = -A_aug[:, :, i]
+        factor[:, i] = 0.0
+        A_aug += factor[:, :, None] * A_aug[:, None, i, :]
+
+        if return_ops:
+            others = [j for j in range(dim) if j != i]
+            ops["op"][:, i, 0] = b"S"
+            ops["i"][:, i, 0] = i
+            ops["j"][:, i, 0] = max_row
+            ops["op"][:, i, 1] = b"M"
+            ops["i"][:, i, 1] = i
+            ops["j"][:, i, 1] = -1
+            ops["scalar"][:, i, 1] = scale
+            ops["op"][:, i, 2:] = b"A"
+            ops["i"][:, i, 2:] = others
+            ops["j"][:, i, 2:] = i
+            ops["scalar"][:, i, 2:] = factor[:, others]
+
+    A_inv = A_aug[:, :, dim:]
+
+    ## Verify the solution, as in the single matrix version
+    product = A @ A_inv
+    degenerate |= ~np.all(np.isclose(product, identity, rtol=1e-10, atol=1e-10), axis=(1, 2))
+    A_inv[degenerate] = np.nan
+
+    if return_ops:
+        ops = ops.reshape(B, dim * (dim + 1))
+
+    return ops, A_inv, degenerate
+
+
+class GaussianFactorization:
+    '''
+    Factors a matrix (or a stack of matrices) once with the batched Gaussian
+    elimination and solves for new right-hand sides by replaying the recorded
+    elementary operations on them.
+    '''
+
+    def __init__(self, A, tol=1e-10):
+        '''
+        Inputs:
+        - A: numpy.ndarray, matrix of shape (dim, dim) or stack of shape (B, dim, dim)
+        - tol: float, pivot tolerance passed to the elimination
+        '''
+        A = np.asarray(A, dtype=np.float64)
+        self.batched = A.ndim == 3
+        if not self.batched:
+            A = A[None]
+        B, dim = A.shape[0], A.shape[1]
+
+        self.ops, _, self.degenerate = perform_gaussian_elemination_batched(A, return_ops=True, tol=tol)
+
+        ## Unpack the op log column by column: ("S", i, p), ("M", i, s), ("A", j, i, f) for j != i
+        ops = self.ops.reshape(B, dim, dim + 1)
+        others = [[j for j in range(dim) if j != i] for i in range(dim)]
+        self.pivots = ops["j"][:, :, 0].astype(np.intp)
+        self.scales = ops["scalar"][:, :, 1]
+        self.factors = np.zeros((B, dim, dim))
+        for i in range(dim):
+            self.factors[:, i, others[i]] = ops["scalar"][:, i, 2:]
+        self.dim = dim
+
+    def solve(self, b):
+        '''
+        Inputs:
+        - b: numpy.ndarray, right-hand sides of shape (dim,) or (dim, k),
+          with a leading batch dimension B if the factorization is batched
+
+        Outputs:
+        - x: numpy.ndarray, solution of A*x = b with the same shape as b,
+          NaN for degenerate matrices
+        '''
+        b = np.asarray(b, dtype=np.float64)
+        if not self.batched:
+            b = b[None]
+        vector = b.ndim == 2
+        X = b[..., None].copy() if vector else b.copy()
+        batch = np.arange(X.shape[0])
+
+        ## Replay the recorded operations on all right-hand sides at once
+        for i in range(self.dim):
+            p = self.pivots[:, i]
+            row_i = X[:, i].copy()
+            X[:, i] = X[batch, p]
+            X[batch, p] = row_i
+            X[:, i] *= self.scales[:, i, None]
+            X += self.factors[:, i, :, None] * X[:, None, i, :]
+
+        X[self.degenerate] = np.nan
+        if vector:
+            X = X[..., 0]
+        if not self.batched:
+            X = X[0]
+        return X
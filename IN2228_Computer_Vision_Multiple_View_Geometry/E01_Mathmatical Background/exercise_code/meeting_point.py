@@ -1,6 +1,74 @@
 
 import numpy as np
 
+def get_orthonormal_basis(pts, tol=1e-10):
+    '''
+    Inputs:
+    - pts: numpy.ndarray, points spanning a subspace of shape (m,num_pts)
+    - tol: float, singular values below tol are treated as zero
+    Outputs:
+    - numpy.ndarray, orthonormal basis of the subspace of shape (m,rank)
+    '''
+    ## columns of u are the basis vectors, for the non-zero singular values
+    u, sigma, _ = np.linalg.svd(pts, full_matrices=False)
+    rank = np.sum(sigma > tol)
+    return u[:, :rank]
+
+def intersect_subspaces(basis_A, basis_B, tol=1e-10):
+    '''
+    Inputs:
+    - basis_A: numpy.ndarray, orthonormal basis of shape (m,rank_A)
+    - basis_B: numpy.ndarray, orthonormal basis of shape (m,rank_B)
+    - tol: float, principal angles whose sine is below tol are treated as zero
+    Outputs:
+    - numpy.ndarray, orthonormal basis of the intersection of shape (m,dim_intersection)
+    '''
+    ## The singular values of basis_A^T basis_B are the cosines of the principal angles
+    ## between the two subspaces, a zero angle is a shared direction.
+    ## Only (rank_A,rank_B) and (m,rank_B) matrices are formed, never (m,m) ones.
+    _, _, Vt = np.linalg.svd(basis_A.T @ basis_B, full_matrices=False)
+    principal_B = basis_B @ Vt.T
+
+    ## Cosines close to one are inaccurate, so measure the angles by their sine,
+    ## i.e. the distance of each principal vector from subspace A.
+    residual = principal_B - basis_A @ (basis_A.T @ principal_B)
+    sines = np.linalg.norm(residual, axis=0)
+    return principal_B[:, sines < tol]
+
+def meeting_point_from_bases(bases, tol=1e-10):
+    '''
+    Inputs:
+    - bases: List[numpy.ndarray], orthonormal basis of each persons subspace of shape (m,rank_i)
+    - tol: float, principal angles whose sine is below tol are treated as zero
+    Outputs:
+    - numpy.ndarray, meeting point or vectors spanning the possible meeting points of shape (m, dim_intersection)
+    '''
+    ## For more than two persons, we intersect the subspaces one after another.
+    null_basis = bases[0]
+    for basis in bases[1:]:
+        if null_basis.shape[1] == 0:
+            break
+        null_basis = intersect_subspaces(null_basis, basis, tol)
+    
+    # Check dimension of intersection
+    null_dim = null_basis.shape[1]
+    
+    # For zero-dimensional intersection (only the origin)
+    # Return an array with correct shape for empty intersection
+    if null_dim == 0:
+        return np.zeros((null_basis.shape[0], 1))  # Empty array with m rows and 0 columns
+    
+    # If the intersection is 1-dimensional, return a single point
+    if null_dim == 1:
+        point = null_basis.flatten()
+        norm = np.linalg.norm(point)
+        if norm > tol:
+            point = point / norm
+        return point.reshape(-1, 1)
+    
+    # Otherwise return the basis for the intersection
+    return null_basis
+
 def meeting_point_linear(pts_list):
     '''
     Inputs:
@@ -8,9 +76,6 @@ def meeting_point_linear(pts_list):
     Outputs:
     - numpy.ndarray, meeting point or vectors spanning the possible meeting points of shape (m, dim_intersection)
     '''
-    A = pts_list[0] # person A's points of shape (m,num_pts_A)
-    B = pts_list[1] # person B's points of shape (m,num_pts_B)
-
     ########################################################################
     # TODO:                                                                #
     # Implement the meeting point algorithm.                               #
@@ -26,56 +91,107 @@ def meeting_point_linear(pts_list):
     #   output vectors spanning the space.                                 #
     ########################################################################
     
-    ## We need to find the intersection of the two subspaces.
+    ## We need to find the intersection of the subspaces.
     ## The intersection of two subspaces is the set of all vectors that belong to both subspaces. It is also a subspace.
     ## In the other words, we need to find v = linear_combination(basis_A) = linear_combination(basis_B)
-    
-    u_A, sigma_A, Vt_A = np.linalg.svd(A, full_matrices=False)
-    u_B, sigma_B, Vt_B = np.linalg.svd(B, full_matrices=False)
-    
-    ## To find the basis of A and B, we need to find the non-zero singular values
-    ## The non-zero singular values are the ones that correspond to the non-zero singular vectors, which are the basis vectors.
-    rank_A = np.sum(sigma_A > 1e-10)
-    rank_B = np.sum(sigma_B > 1e-10)
-    
-    ## columns of u_A and u_B are the basis vectors of A and B respectively
-    basis_A = u_A[:, :rank_A]
-    basis_B = u_B[:, :rank_B]
-    
-    ## The orthogonal complement of a subspace S is the set of all vectors that are perpendicular (orthogonal) to every vector in S
-    ## Given a subspace S, the orthonormal basis contains in the columns of the materix A
-    ## The projection matrix P of a subspace S is given by P = A * A^T
-    ## The orthogonal complement of a subspace S is given by P_orth = I - P
-    ## We need to find the intersection of the two subspaces.
-    orth_A = np.eye(A.shape[0]) - np.dot(basis_A, basis_A.T)
-    orth_B = np.eye(B.shape[0]) - np.dot(basis_B, basis_B.T)
-    
-    stacked = np.vstack((orth_A, orth_B))
 
-    ## Find the null space of the stacked matrix
-    u, sigma, Vt = np.linalg.svd(stacked, full_matrices=True)
-    rank_stacked = np.sum(sigma > 1e-10)
-    null_basis = Vt[rank_stacked:, :].T
-    
-    # Check dimension of intersection
-    null_dim = null_basis.shape[1]
-    
-    # For zero-dimensional intersection (only the origin)
-    # Return an array with correct shape for empty intersection
-    if null_dim == 0:
-        return np.zeros((A.shape[0], 1))  # Empty array with m rows and 0 columns
-    
-    # If the intersection is 1-dimensional, return a single point
-    if null_dim == 1:
-        point = null_basis.flatten()
-        norm = np.linalg.norm(point)
-        if norm > 1e-10:
-            point = point / norm
-        return point.reshape(-1, 1)
-    
-    # Otherwise return the basis for the intersection
-    return null_basis
+    return meeting_point_from_bases([get_orthonormal_basis(pts) for pts in pts_list])
 
     ########################################################################
     #                           END OF YOUR CODE                           #
     ########################################################################
+
+
+class IncrementalSubspace:
+    '''
+    Orthonormal basis of the span of a growing set of points, kept up to date
+    with rank-one updates of the thin SVD (Brand, 2006). Only the left singular
+    vectors and the singular values are stored, so appending a point costs
+    O(m*rank + rank^3) regardless of how many points were seen before.
+    '''
+
+    def __init__(self, m, tol=1e-10):
+        '''
+        Inputs:
+        - m: int, dimension of the space
+        - tol: float, singular values below tol are treated as zero
+        '''
+        self.tol = tol
+        self.basis = np.zeros((m, 0))
+        self.sigma = np.zeros(0)
+
+    def append(self, pt):
+        '''
+        Inputs:
+        - pt: numpy.ndarray, new point of shape (m,)
+        '''
+        U, rank = self.basis, self.sigma.shape[0]
+
+        ## Split the point into its component in the subspace and the residual,
+        ## orthogonalizing twice to keep the basis orthonormal over many updates
+        p = U.T @ pt
+        residual = pt - U @ p
+        correction = U.T @ residual
+        residual -= U @ correction
+        p += correction
+        rho = np.linalg.norm(residual)
+
+        ## Re-diagonalize the small (rank+1,rank+1) core matrix
+        ## [[diag(sigma), p], [0, rho]]
+        if rho > self.tol:
+            K = np.zeros((rank + 1, rank + 1))
+            K[:rank, :rank] = np.diag(self.sigma)
+            K[:rank, rank] = p
+            K[rank, rank] = rho
+            u_K, sigma, _ = np.linalg.svd(K)
+            U = np.hstack((U, residual[:, None] / rho)) @ u_K
+        else:
+            K = np.hstack((np.diag(self.sigma), p[:, None]))
+            u_K, sigma, _ = np.linalg.svd(K, full_matrices=False)
+            U = U @ u_K
+
+        keep = sigma > self.tol
+        self.basis = U[:, keep]
+        self.sigma = sigma[keep]
+
+
+class MeetingPointTracker:
+    '''
+    Meeting point of several persons whose point sets grow over time.
+    Each subspace is tracked incrementally and the intersection is only
+    recomputed, from the small orthonormal bases, when it is requested
+    after new points arrived.
+    '''
+
+    def __init__(self, m, num_persons=2, tol=1e-10):
+        '''
+        Inputs:
+        - m: int, dimension of the space
+        - num_persons: int, number of persons
+        - tol: float, singular values and principal angle sines below tol are treated as zero
+        '''
+        self.tol = tol
+        self.subspaces = [IncrementalSubspace(m, tol) for _ in range(num_persons)]
+        self.output = None
+
+    def append(self, person, pts):
+        '''
+        Inputs:
+        - person: int, index of the person the points belong to
+        - pts: numpy.ndarray, new points of shape (m,) or (m,num_pts)
+        '''
+        pts = np.asarray(pts, dtype=np.float64)
+        if pts.ndim == 1:
+            pts = pts[:, None]
+        for pt in pts.T:
+            self.subspaces[person].append(pt)
+        self.output = None
+
+    def meeting_point(self):
+        '''
+        Outputs:
+        - numpy.ndarray, meeting point or vectors spanning the possible meeting points of shape (m, dim_intersection)
+        '''
+        if self.output is None:
+            self.output = meeting_point_from_bases([subspace.basis for subspace in self.subspaces], self.tol)
+        return self.output
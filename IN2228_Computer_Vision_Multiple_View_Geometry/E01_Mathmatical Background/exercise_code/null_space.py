@@ -1,10 +1,12 @@
 import numpy as np
-def get_null_vector(D):
+def get_null_vector(D, tol=1e-10):
     '''
     Inputs:
-    - D: numpy.ndarray, matrix of shape (m,n)
+    - D: numpy.ndarray, matrix of shape (m,n) or stack of matrices of shape (B,m,n)
+    - tol: float, singular values below tol are treated as zero
     Outputs:
-    - null_vector: numpy.ndarray, matrix of shape (dim_kern,n)
+    - null_vector: numpy.ndarray, matrix of shape (dim_kern,n),
+      or a list of B such matrices for a stack of matrices
     '''
 
     ########################################################################
@@ -16,11 +18,21 @@ def get_null_vector(D):
     # The kernel of a matrix D is the set of all vectors x such that D*x = 0.
     # The kernel is also a subspace of the vector space.
     # The null space corresponds to the 0 singular values of the matrix D.
-    
+
+    ## For a tall D = Q*R, the matrices D and R share the singular values and vt,
+    ## so we only decompose the small (n,n) factor R and never form an (m,m) U.
+    m, n = D.shape[-2:]
+    if m > n:
+        D = np.linalg.qr(D, mode='r')
+
     u, sigma, vt = np.linalg.svd(D, full_matrices=True)
-    rank = np.sum(sigma > 1e-10)
-    null_vector = vt[rank:, :]
-    
+
+    ## Singular values beyond min(m,n) are implicitly zero
+    rank = np.sum(sigma > tol, axis=-1)
+    if D.ndim == 2:
+        null_vector = vt[rank:, :]
+    else:
+        null_vector = [vt_b[rank_b:, :] for vt_b, rank_b in zip(vt, rank)]
    
     # As alternaltive, we can use the null space function from scipy
     # from scipy.linalg import null_space
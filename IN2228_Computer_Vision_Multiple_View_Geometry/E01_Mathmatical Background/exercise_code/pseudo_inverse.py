@@ -1,13 +1,47 @@
 import numpy as np
 
-def solve_linear_equation_SVD(D, b):
+def randomized_svd(D, rank, n_oversamples=10, n_iter=2, seed=None):
     '''
     Inputs:
     - D: numpy.ndarray, matrix of shape (m,n)
-    - b: numpy.ndarray, vector of shape (m,)
+    - rank: int, number of singular directions to keep
+    - n_oversamples: int, extra random samples to stabilize the range estimate
+    - n_iter: int, number of power iterations
+    - seed: int or None, seed of the random test matrix
     Outputs:
-    - x: numpy.ndarray, solution of the linear equation D*x = b
-    - D_inv: numpy.ndarray, pseudo-inverse of D of shape (n,m)
+    - u: numpy.ndarray, left singular vectors of shape (m,rank)
+    - sigma: numpy.ndarray, singular values of shape (rank,)
+    - vt: numpy.ndarray, right singular vectors of shape (rank,n)
+    '''
+    m, n = D.shape
+    rng = np.random.default_rng(seed)
+    n_samples = min(rank + n_oversamples, m, n)
+
+    ## Orthonormal basis of the (approximate) range of D
+    Q, _ = np.linalg.qr(D @ rng.standard_normal((n, n_samples)))
+    for _ in range(n_iter):
+        Q, _ = np.linalg.qr(D.T @ Q)
+        Q, _ = np.linalg.qr(D @ Q)
+
+    ## SVD of the small projected matrix
+    u_small, sigma, vt = np.linalg.svd(Q.T @ D, full_matrices=False)
+    u = Q @ u_small
+    return u[:, :rank], sigma[:rank], vt[:rank]
+
+def solve_linear_equation_SVD(D, b, return_inverse=True, rank=None, tol=1e-10, seed=0):
+    '''
+    Inputs:
+    - D: numpy.ndarray, matrix of shape (m,n)
+    - b: numpy.ndarray, vector of shape (m,) or matrix of shape (m,k) with one right-hand side per column
+    - return_inverse: bool, whether to materialize the pseudo-inverse
+    - rank: int or None, if given only the top rank singular directions are
+      used, computed with a randomized SVD
+    - tol: float, singular values below tol are treated as zero
+    - seed: int or None, seed of the randomized SVD, fixed by default so
+      repeated solves of the same system agree
+    Outputs:
+    - x: numpy.ndarray, solution of the linear equation D*x = b of shape (n,) or (n,k)
+    - D_inv: numpy.ndarray, pseudo-inverse of D of shape (n,m), or None if return_inverse is False
     '''
 
     ########################################################################
@@ -18,21 +52,27 @@ def solve_linear_equation_SVD(D, b):
 
     # The pseudo-inverse of a matrix D is defined as:
     # D_inv = V * S_inv * U^T
-    
-    u, sigma, vt = np.linalg.svd(D, full_matrices=True)
-    
-    ## Get dim of D
-    m, n = D.shape
+    # The economy SVD is enough, the extra columns of a full U only meet zeros in S_inv.
+
+    if rank is None:
+        u, sigma, vt = np.linalg.svd(D, full_matrices=False)
+    else:
+        u, sigma, vt = randomized_svd(D, rank, seed=seed)
+
+    ## S_inv is the pseudo-inverse of sigma, kept as a vector
+    sigma_inv = np.zeros_like(sigma)
+    nonzero = sigma > tol
+    sigma_inv[nonzero] = 1/sigma[nonzero]
+
+    ## x = V * S_inv * U^T * b, without forming D_inv
+    ub = u.T @ b
+    ub = ub * sigma_inv.reshape((-1,) + (1,) * (ub.ndim - 1))
+    x = vt.T @ ub
 
-    ## S_inv is the pseudo-inverse of sigma
-    S_inv = np.zeros((n, m))
-    for i in range(min(m, n)):
-        if sigma[i] > 1e-10:
-            S_inv[i, i] = 1/sigma[i]
-    
     ## Calculate the pseudo-inverse of D
-    D_inv = vt.T @ S_inv @ u.T
-    x = D_inv @ b
+    D_inv = None
+    if return_inverse:
+        D_inv = (vt.T * sigma_inv) @ u.T
 
     ########################################################################
     #                           END OF YOUR CODE                           #
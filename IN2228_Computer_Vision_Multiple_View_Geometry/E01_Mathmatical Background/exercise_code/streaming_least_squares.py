@@ -0,0 +1,80 @@
+import numpy as np
+from .pseudo_inverse import solve_linear_equation_SVD
+
+class StreamingLeastSquares:
+    '''
+    Least squares solver for D*x = b where the rows of D and b arrive in blocks.
+
+    The rows are folded into the R factor of the QR decomposition of the
+    augmented matrix [D | b]:
+
+        [D | b] = Q * [[R, z],
+                       [0, t]]
+
+    so that R*x = z is the least squares solution and |t| the residual norm.
+    Only this (n+k)x(n+k) factor is kept, independent of the number of rows.
+    '''
+
+    def __init__(self, n, rcond=1e-10):
+        '''
+        Inputs:
+        - n: int, number of unknowns (columns of D)
+        - rcond: float, singular values of R below rcond*|R| are treated as zero
+        '''
+        self.n = n
+        self.rcond = rcond
+        self.R_aug = None
+        self.vector = True
+        self.num_rows = 0
+
+    def update(self, D_block, b_block):
+        '''
+        Inputs:
+        - D_block: numpy.ndarray, block of rows of D of shape (m_block,n)
+        - b_block: numpy.ndarray, matching entries of b of shape (m_block,) or (m_block,k)
+        '''
+        b_block = np.asarray(b_block, dtype=np.float64)
+        if self.R_aug is None:
+            self.vector = b_block.ndim == 1
+            k = 1 if self.vector else b_block.shape[1]
+            self.R_aug = np.zeros((self.n + k, self.n + k))
+        if self.vector:
+            b_block = b_block[:, None]
+
+        ## Re-triangularize the old factor together with the new rows
+        block = np.hstack((np.asarray(D_block, dtype=np.float64), b_block))
+        self.R_aug = np.linalg.qr(np.vstack((self.R_aug, block)), mode='r')
+        self.num_rows += block.shape[0]
+
+    def solution(self):
+        '''
+        Outputs:
+        - x: numpy.ndarray, current least squares solution of shape (n,) or (n,k),
+          zeros of shape (n,) (the minimum norm solution) before any rows are added
+        '''
+        if self.R_aug is None:
+            return np.zeros(self.n)
+
+        R = self.R_aug[:self.n, :self.n]
+        z = self.R_aug[:self.n, self.n:]
+
+        ## Conditioning guard: solve R*x = z through the pseudo-inverse,
+        ## dropping directions that the rows seen so far do not determine
+        x, _ = solve_linear_equation_SVD(R, z, return_inverse=False, tol=self.rcond * np.linalg.norm(R))
+        if self.vector:
+            x = x[:, 0]
+        return x
+
+    def residual_norm(self):
+        '''
+        Outputs:
+        - residual: float or numpy.ndarray of shape (k,), norm of D*x - b for the current solution,
+          0.0 before any rows are added
+        '''
+        if self.R_aug is None:
+            return 0.0
+
+        residual = np.linalg.norm(self.R_aug[self.n:, self.n:], axis=0)
+        if self.vector:
+            residual = residual[0]
+        return residual
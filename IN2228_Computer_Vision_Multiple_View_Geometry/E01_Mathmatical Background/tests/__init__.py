@@ -1,4 +1,5 @@
 
 from .test_compute_meetingpoint import test_compute_meetingpoint
 from .test_gaussian_elimination import test_gaussian_elimination
-from .test_pseudo_inverse import test_pseudo_inverse, generate_matrix, generate_plt_data
\ No newline at end of file
+from .test_pseudo_inverse import test_pseudo_inverse, generate_matrix, generate_plt_data
+from .test_streaming_least_squares import test_streaming_least_squares
\ No newline at end of file
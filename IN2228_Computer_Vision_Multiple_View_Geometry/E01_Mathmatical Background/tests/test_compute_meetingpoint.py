@@ -1,7 +1,7 @@
 import numpy as np
 from .base_tests import UnitTest, CompositeTest, test_results_to_score
 
-from exercise_code.meeting_point import meeting_point_linear
+from exercise_code.meeting_point import meeting_point_linear, MeetingPointTracker
 
 class MeetingPointOneDim(UnitTest):
     def __init__(self) -> None:
@@ -52,11 +52,95 @@ class MeetingPointZeroDim(UnitTest):
         return f"The output of the meeting point is incorrect (expected {self.c}, got {self.output[:,0]})."
 
 
+class MeetingPointThreePersons(UnitTest):
+    def __init__(self) -> None:
+        self.output = None
+        # Three subspaces in R^500 sharing a plane
+        m = 500
+        self.shared = np.random.randn(m, 2)
+        self.PTS_a = np.hstack((self.shared, np.random.randn(m, 3))) @ np.random.randn(5, 10)
+        self.PTS_b = np.hstack((self.shared, np.random.randn(m, 4))) @ np.random.randn(6, 12)
+        self.PTS_c = np.hstack((self.shared, np.random.randn(m, 1))) @ np.random.randn(3, 7)
+
+    def test(self):
+        self.output = meeting_point_linear([self.PTS_a, self.PTS_b, self.PTS_c])
+        if self.output.shape[1] != 2:
+            return False
+        # the output must span the shared plane
+        projection = self.output @ (self.output.T @ self.shared)
+        return np.allclose(projection, self.shared)
+
+    def define_success_message(self):
+        return f"Congratulations: You passed the test case for the case of three persons."
+
+    def define_failure_message(self):
+        return f"The output of the meeting point is incorrect (expected a basis of shape {self.shared.shape}, got {self.output.shape})."
+
+
+class MeetingPointIncremental(UnitTest):
+    def __init__(self) -> None:
+        self.output = None
+        # Two subspaces in R^200 sharing a plane, observed point by point
+        m = 200
+        self.shared = np.random.randn(m, 2)
+        self.PTS_a = np.hstack((self.shared, np.random.randn(m, 3))) @ np.random.randn(5, 60)
+        self.PTS_b = np.hstack((self.shared, np.random.randn(m, 4))) @ np.random.randn(6, 80)
+
+    def test(self):
+        tracker = MeetingPointTracker(self.shared.shape[0])
+        for i in range(self.PTS_a.shape[1]):
+            tracker.append(0, self.PTS_a[:, i])
+        for i in range(0, self.PTS_b.shape[1], 10):
+            tracker.append(1, self.PTS_b[:, i:i+10])
+        self.output = tracker.meeting_point()
+        if [subspace.basis.shape[1] for subspace in tracker.subspaces] != [5, 6] or self.output.shape[1] != 2:
+            return False
+        projection = self.output @ (self.output.T @ self.shared)
+        return np.allclose(projection, self.shared)
+
+    def define_success_message(self):
+        return f"Congratulations: You passed the test case for the incremental meeting point."
+
+    def define_failure_message(self):
+        return f"The output of the incremental meeting point is incorrect (expected a basis of shape {self.shared.shape}, got {self.output.shape})."
+
+
+class MeetingPointIncrementalNoisy(UnitTest):
+    def __init__(self) -> None:
+        self.output = None
+        # Two subspaces in R^100 sharing a plane, with noise far below the tracker tolerance
+        m = 100
+        self.shared = np.random.randn(m, 2)
+        self.PTS_a = np.hstack((self.shared, np.random.randn(m, 2))) @ np.random.randn(4, 20)
+        self.PTS_b = np.hstack((self.shared, np.random.randn(m, 3))) @ np.random.randn(5, 20)
+        self.PTS_a += 1e-9 * np.random.randn(*self.PTS_a.shape)
+        self.PTS_b += 1e-9 * np.random.randn(*self.PTS_b.shape)
+
+    def test(self):
+        tracker = MeetingPointTracker(self.shared.shape[0], tol=1e-6)
+        tracker.append(0, self.PTS_a)
+        tracker.append(1, self.PTS_b)
+        self.output = tracker.meeting_point()
+        if [subspace.basis.shape[1] for subspace in tracker.subspaces] != [4, 5] or self.output.shape[1] != 2:
+            return False
+        projection = self.output @ (self.output.T @ self.shared)
+        return np.allclose(projection, self.shared, atol=1e-6)
+
+    def define_success_message(self):
+        return f"Congratulations: You passed the test case for the noisy incremental meeting point."
+
+    def define_failure_message(self):
+        return f"The output of the noisy incremental meeting point is incorrect (expected a basis of shape {self.shared.shape}, got {self.output.shape})."
+
+
 class MeetingPointTest(CompositeTest):
     def define_tests(self):
         return [
             MeetingPointOneDim(),
-            MeetingPointZeroDim()
+            MeetingPointZeroDim(),
+            MeetingPointThreePersons(),
+            MeetingPointIncremental(),
+            MeetingPointIncrementalNoisy()
         ]
 
 
@@ -1,7 +1,7 @@
 import numpy as np
 from .base_tests import UnitTest, CompositeTest, test_results_to_score
 
-from exercise_code.gaussian_elemination import swap_rows, multiply_row, add_row, perform_gaussian_elemination
+from exercise_code.gaussian_elemination import swap_rows, multiply_row, add_row, perform_gaussian_elemination, perform_gaussian_elemination_batched, GaussianFactorization
 
 class GaussianElimination_mat(UnitTest):
     def __init__(self) -> None:
@@ -53,13 +53,92 @@ class GaussianElimination_ops(UnitTest):
     def define_failure_message(self):
         return f"The output of the Gaussian elimination is incorrect (expected {self.A_inv}, got {self.output})."
     
+class GaussianElimination_batched(UnitTest):
+    def __init__(self) -> None:
+        self.A = np.random.randn(50, 6, 6)
+        self.A[3] = np.array([[1, 2, 3, 4, 5, 6]] * 6)  # singular matrix
+        self.A_inv = np.linalg.inv(np.delete(self.A, 3, axis=0))
+        self.output = None
+
+    def test(self):
+        _, A_inv, degenerate = perform_gaussian_elemination_batched(self.A)
+        self.output = degenerate
+        expected_degenerate = np.zeros(50, dtype=bool)
+        expected_degenerate[3] = True
+        return (np.array_equal(degenerate, expected_degenerate)
+                and np.all(np.isnan(A_inv[3]))
+                and np.allclose(np.delete(A_inv, 3, axis=0), self.A_inv))
+
+    def define_success_message(self):
+        return f"Congratulations: You passed the test case for the batched Gaussian elimination."
+
+    def define_failure_message(self):
+        return f"The output of the batched Gaussian elimination is incorrect (degenerate flags {self.output})."
+
+
+class GaussianElimination_batched_ops(UnitTest):
+    def __init__(self) -> None:
+        self.A = np.random.randn(4, 5, 5)
+        self.A_inv = np.linalg.inv(self.A)
+        self.output = None
+
+    def test(self):
+        ops, _, _ = perform_gaussian_elemination_batched(self.A, return_ops=True)
+        self.output = np.zeros_like(self.A)
+        for b in range(self.A.shape[0]):
+            A_inv = np.eye(self.A.shape[1])
+            for op, i, j, scalar in ops[b]:
+                if op == b'S':
+                    A_inv = swap_rows(A_inv, i, j)
+                elif op == b'M':
+                    A_inv = multiply_row(A_inv, i, scalar)
+                elif op == b'A':
+                    A_inv = add_row(A_inv, i, j, scalar)
+            self.output[b] = A_inv
+        return np.allclose(self.output, self.A_inv)
+
+    def define_success_message(self):
+        return f"Congratulations: You passed the test case for the batched Gaussian elimination operations."
+
+    def define_failure_message(self):
+        return f"The replayed batched operations are incorrect (expected {self.A_inv}, got {self.output})."
+
+
+class GaussianElimination_factorization(UnitTest):
+    def __init__(self) -> None:
+        self.A = np.random.randn(5, 5)
+        self.A_batch = np.random.randn(8, 4, 4)
+        self.b = np.random.randn(5)
+        self.B = np.random.randn(5, 3)
+        self.B_batch = np.random.randn(8, 4, 2)
+        self.output = None
+
+    def test(self):
+        factorization = GaussianFactorization(self.A)
+        x = factorization.solve(self.b)
+        X = factorization.solve(self.B)
+        X_batch = GaussianFactorization(self.A_batch).solve(self.B_batch)
+        self.output = x
+        return (x.shape == self.b.shape
+                and np.allclose(self.A @ x, self.b)
+                and np.allclose(self.A @ X, self.B)
+                and np.allclose(self.A_batch @ X_batch, self.B_batch))
+
+    def define_success_message(self):
+        return f"Congratulations: You passed the test case for the Gaussian factorization."
+
+    def define_failure_message(self):
+        return f"The output of the Gaussian factorization is incorrect (expected {np.linalg.solve(self.A, self.b)}, got {self.output})."
 
 
 class GaussianEliminationTest(CompositeTest):
     def define_tests(self):
         return [
             GaussianElimination_mat(),
-            GaussianElimination_ops()
+            GaussianElimination_ops(),
+            GaussianElimination_batched(),
+            GaussianElimination_batched_ops(),
+            GaussianElimination_factorization()
         ]
 
 
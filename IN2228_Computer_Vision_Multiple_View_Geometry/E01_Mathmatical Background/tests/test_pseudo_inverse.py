@@ -164,13 +164,99 @@ class PseudoInverseTest3(UnitTest):
         return f"Failure: You failed the third test case for the pseudo inverse. b = {self.b}, b_ = {self.b_}"
 
 
+class PseudoInverseTest4(UnitTest):
+    def __init__(self) -> None:
+        return
+
+    def test(self):
+        D = np.random.randn(500, 6)
+        self.B = np.random.randn(500, 3)
+        self.x_hat, D_inv = solve_linear_equation_SVD(D, self.B, return_inverse=False)
+        self.x_ref = np.linalg.lstsq(D, self.B, rcond=None)[0]
+        return D_inv is None and np.allclose(self.x_hat, self.x_ref)
+
+    def define_success_message(self):
+        return f"Congratulations: You passed the test case for the economy SVD with multiple right-hand sides."
+
+    def define_failure_message(self):
+        return f"Failure: You failed the test case for the economy SVD. x = {self.x_ref}, x_hat = {self.x_hat}"
+
+
+class PseudoInverseTest5(UnitTest):
+    def __init__(self) -> None:
+        return
+
+    def test(self):
+        # tall matrix of rank 4
+        D = np.random.randn(1000, 4) @ np.random.randn(4, 30)
+        b = np.random.randn(1000)
+        self.x_hat, _ = solve_linear_equation_SVD(D, b, return_inverse=False, rank=4)
+        self.x_ref = np.linalg.pinv(D) @ b
+        return np.allclose(self.x_hat, self.x_ref)
+
+    def define_success_message(self):
+        return f"Congratulations: You passed the test case for the truncated SVD."
+
+    def define_failure_message(self):
+        return f"Failure: You failed the test case for the truncated SVD. x = {self.x_ref}, x_hat = {self.x_hat}"
+
+
+class PseudoInverseTest6(UnitTest):
+    def __init__(self) -> None:
+        return
+
+    def test(self):
+        # full rank matrix, so the truncated solution depends on the random test matrix
+        D = np.random.randn(200, 12)
+        b = np.random.randn(200)
+        x1, _ = solve_linear_equation_SVD(D, b, return_inverse=False, rank=4)
+        x2, _ = solve_linear_equation_SVD(D, b, return_inverse=False, rank=4)
+        x3, _ = solve_linear_equation_SVD(D, b, return_inverse=False, rank=4, seed=7)
+        x4, _ = solve_linear_equation_SVD(D, b, return_inverse=False, rank=4, seed=7)
+        self.diff = np.abs(x1 - x2).max()
+        return np.array_equal(x1, x2) and np.array_equal(x3, x4)
+
+    def define_success_message(self):
+        return f"Congratulations: You passed the test case for reproducible truncated SVD solves."
+
+    def define_failure_message(self):
+        return f"Failure: You failed the test case for reproducible truncated SVD solves. max difference = {self.diff}"
+
+
+class NullSpaceTest(UnitTest):
+    def __init__(self) -> None:
+        return
+
+    def test(self):
+        # tall stacked constraints of rank 3 and a batch of tall matrices
+        D = np.random.randn(5000, 3) @ np.random.randn(3, 5)
+        D_batch = np.random.randn(4, 100, 5)
+        D_batch[2, :, 4] = D_batch[2, :, 0]
+        v = get_null_vector(D)
+        v_batch = get_null_vector(D_batch, tol=1e-8)
+        self.dims = (v.shape[0], [v_b.shape[0] for v_b in v_batch])
+        return (self.dims == (2, [0, 0, 1, 0])
+                and np.allclose(D @ v.T, 0)
+                and np.allclose(D_batch[2] @ v_batch[2].T, 0))
+
+    def define_success_message(self):
+        return f"Congratulations: You passed the test case for the null space of tall and batched matrices."
+
+    def define_failure_message(self):
+        return f"Failure: You failed the test case for the null space of tall and batched matrices. kernel dimensions = {self.dims}"
+
+
 class PseudoInverseTest(CompositeTest):
     def define_tests(self):
         return [
             MatrixConstructionTest(),
             PseudoInverseTest1(),
             PseudoInverseTest2(),
-            PseudoInverseTest3()
+            PseudoInverseTest3(),
+            PseudoInverseTest4(),
+            PseudoInverseTest5(),
+            PseudoInverseTest6(),
+            NullSpaceTest()
         ]
 
 def test_pseudo_inverse():
@@ -0,0 +1,80 @@
+import numpy as np
+from .base_tests import UnitTest, CompositeTest, test_results_to_score
+
+from exercise_code.streaming_least_squares import StreamingLeastSquares
+
+class StreamingLeastSquaresBlocks(UnitTest):
+    def __init__(self) -> None:
+        self.D = np.random.randn(2000, 8)
+        self.b = self.D @ np.random.randn(8) + 1e-2 * np.random.randn(2000)
+        self.x_ref = np.linalg.lstsq(self.D, self.b, rcond=None)[0]
+        self.residual_ref = np.linalg.norm(self.D @ self.x_ref - self.b)
+        self.output = None
+
+    def test(self):
+        solver = StreamingLeastSquares(8)
+        for start in range(0, 2000, 300):
+            solver.update(self.D[start:start + 300], self.b[start:start + 300])
+        self.output = solver.solution()
+        return (solver.R_aug.shape == (9, 9)
+                and np.allclose(self.output, self.x_ref)
+                and np.allclose(solver.residual_norm(), self.residual_ref))
+
+    def define_success_message(self):
+        return f"Congratulations: You passed the test case for the streaming least squares solver."
+
+    def define_failure_message(self):
+        return f"The output of the streaming least squares solver is incorrect (expected {self.x_ref}, got {self.output})."
+
+
+class StreamingLeastSquaresRankDeficient(UnitTest):
+    def __init__(self) -> None:
+        # the last column never gets excited, so D has rank 3
+        self.D = np.hstack((np.random.randn(100, 3), np.zeros((100, 1))))
+        self.B = np.random.randn(100, 2)
+        self.x_ref = np.linalg.pinv(self.D) @ self.B
+        self.output = None
+
+    def test(self):
+        solver = StreamingLeastSquares(4)
+        for start in range(0, 100, 10):
+            solver.update(self.D[start:start + 10], self.B[start:start + 10])
+        self.output = solver.solution()
+        return np.allclose(self.output, self.x_ref)
+
+    def define_success_message(self):
+        return f"Congratulations: You passed the test case for the rank deficient streaming least squares solver."
+
+    def define_failure_message(self):
+        return f"The output of the rank deficient streaming least squares solver is incorrect (expected {self.x_ref}, got {self.output})."
+
+
+class StreamingLeastSquaresEmpty(UnitTest):
+    def __init__(self) -> None:
+        self.output = None
+
+    def test(self):
+        # before any rows arrive the solution can already be read
+        solver = StreamingLeastSquares(5)
+        self.output = (solver.solution(), solver.residual_norm())
+        return np.array_equal(self.output[0], np.zeros(5)) and self.output[1] == 0.0
+
+    def define_success_message(self):
+        return f"Congratulations: You passed the test case for the empty streaming least squares solver."
+
+    def define_failure_message(self):
+        return f"The empty streaming least squares solver should return zeros and a zero residual (got {self.output})."
+
+
+class StreamingLeastSquaresTest(CompositeTest):
+    def define_tests(self):
+        return [
+            StreamingLeastSquaresBlocks(),
+            StreamingLeastSquaresRankDeficient(),
+            StreamingLeastSquaresEmpty()
+        ]
+
+
+def test_streaming_least_squares():
+    test = StreamingLeastSquaresTest()
+    return test_results_to_score(test())
@@ -1,3 +1,5 @@
+import os
+import tempfile
 import numpy as np
 from math import tan, atan
 from abc import ABC, abstractmethod
@@ -31,10 +33,98 @@ def compute_relative_pose(pose_1,pose_2):
     return pose
 
 
+def compute_relative_poses(poses_1, poses_2):
+    '''
+    Inputs:
+    - poses_i stack of transforms from cam_i to world coordinates, array of shape (N,3,4)
+    Outputs:
+    - poses transforming from cam_1 to cam_2 coordinates for every n, array of shape (N,3,4)
+    '''
+    R1, T1 = poses_1[..., :3], poses_1[..., 3]
+    R2, T2 = poses_2[..., :3], poses_2[..., 3]
+
+    ## R2^T R1 and R2^T (T1 - T2) for all poses at once
+    R_real = np.einsum('nji,njk->nik', R2, R1)
+    T_real = np.einsum('nji,nj->ni', R2, T1 - T2)
+
+    return np.concatenate((R_real, T_real[..., None]), axis=-1)
+
+
+def compute_all_relative_poses(poses, pairs=None):
+    '''
+    Inputs:
+    - poses stack of transforms from cam_i to world coordinates, array of shape (N,3,4)
+    - pairs optional array of shape (P,2) with the requested (i, j) index pairs
+    Outputs:
+    - if pairs is None, dense array of shape (N,N,3,4) whose entry [i, j] transforms
+      from cam_i to cam_j coordinates, otherwise array of shape (P,3,4) with one
+      transform per requested pair
+    '''
+    if pairs is not None:
+        pairs = np.asarray(pairs)
+        return compute_relative_poses(poses[pairs[:, 0]], poses[pairs[:, 1]])
+
+    R, T = poses[..., :3], poses[..., 3]
+
+    ## [i, j]: R_j^T R_i and R_j^T T_i - R_j^T T_j
+    R_real = np.einsum('jba,ibc->ijac', R, R)
+    RT = np.einsum('jba,ib->ija', R, T)
+    T_real = RT - np.diagonal(RT, axis1=0, axis2=1).T[None]
+
+    return np.concatenate((R_real, T_real[..., None]), axis=-1)
+
+
+def world_to_camera_poses(poses):
+    '''
+    Inputs:
+    - poses stack of transforms from cam_i to world coordinates, array of shape (M,3,4)
+    Outputs:
+    - transforms from world to cam_i coordinates, array of shape (M,3,4)
+    '''
+    # the world frame is a camera with identity pose
+    world = np.broadcast_to(np.eye(3, 4), poses.shape)
+    return compute_relative_poses(world, poses)
+
+
+def fov_constants(W):
+    '''
+    Inputs:
+    - W, full field of view of the Fov model, scalar or array
+    Outputs:
+    - is_pinhole, whether W is close to 0 and the model degenerates to the pinhole model
+    - tan_omega, tan(W / 2)
+    - inv_W, 1 / W, 0 for the pinhole case
+    '''
+    W = np.asarray(W, dtype=np.float64)
+    is_pinhole = np.abs(W / 2.0) < 1e-8
+    tan_omega = np.tan(W / 2.0)
+    inv_W = np.where(is_pinhole, 0.0, 1.0 / np.where(is_pinhole, 1.0, W))
+    return is_pinhole, tan_omega, inv_W
+
+
+def fov_distort(x_n, is_pinhole, tan_omega, inv_W):
+    '''
+    Inputs:
+    - x_n, normalized image coordinates, array of shape (..., 2)
+    - is_pinhole, tan_omega, inv_W, constants from fov_constants, broadcastable to x_n[..., :1]
+    Outputs:
+    - x_d, distorted normalized coordinates, array of shape (..., 2)
+    '''
+    ru = np.linalg.norm(x_n, axis=-1, keepdims=True)
+
+    # rd = (1/ω) * arctan(2 * ru * tan(ω/2)), or rd = ru for the pinhole case
+    rd = np.where(is_pinhole, ru, np.arctan(2.0 * ru * tan_omega) * inv_W)
+
+    # points on the optical axis map to the principal point
+    valid = ru > 1e-8
+    return x_n * np.where(valid, rd / np.where(valid, ru, 1.0), 0.0)
+
+
 class Camera(ABC):
     def __init__(self, w, h):
         self.w = w
         self.h = h
+        self.ray_tables = {}
 
     @abstractmethod
     def project(self, pt):
@@ -44,36 +134,151 @@ class Camera(ABC):
     def unproject(self, pix, d):
         """Unproject the pixel pix into the 3D camera space for the given distance d"""
 
+    def intrinsics(self):
+        """Parameters of the camera model besides the image size, as a flat array"""
+        return np.ravel(self.K)
+
+    def ray_table_key(self, depth=False):
+        '''
+        Inputs:
+        - depth, mode of the ray table as in ray_table
+        Outputs:
+        - key, float64 array identifying the ray table: image size, mode and intrinsics
+        '''
+        return np.concatenate(([self.w, self.h, float(depth)], self.intrinsics())).astype(np.float64)
+
+    def ray_table(self, depth=False, cache_path=None, block_rows=64):
+        '''
+        Inputs:
+        - depth, if True the rays are scaled to unit depth (z = 1) instead of unit length
+        - cache_path, optional .npy file holding the table as a memory map, reused if it was built
+          for the same intrinsics, image size and mode (stored next to it in <cache_path>.key.npy)
+        - block_rows, number of image rows unprojected at once while building the table
+        Outputs:
+        - rays, float32 array of shape (h, w, 3) with the ray of each pixel (u, v) at rays[v, u]
+        The table only depends on the intrinsics, so it is built once and cached on the camera
+        under its key and cache_path.
+        '''
+        key = self.ray_table_key(depth)
+        memory_key = (key.tobytes(), cache_path)
+        if memory_key in self.ray_tables:
+            return self.ray_tables[memory_key]
+
+        shape = (self.h, self.w, 3)
+        if cache_path is not None:
+            key_path = cache_path + '.key.npy'
+            if os.path.exists(cache_path) and os.path.exists(key_path) and np.array_equal(np.load(key_path), key):
+                rays = np.load(cache_path, mmap_mode='r')
+                if rays.shape == shape and rays.dtype == np.float32:
+                    self.ray_tables[memory_key] = rays
+                    return rays
+
+            ## Build into a new file and move it over the old one, so tables still mapped from the old file stay valid.
+            ## The file name is unique, so processes building the same table do not write into each other's file.
+            tmp_path = self._temporary_file(cache_path)
+            rays = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32, shape=shape)
+        else:
+            rays = np.empty(shape, dtype=np.float32)
+
+        u = np.arange(self.w, dtype=np.float32)
+        for v0 in range(0, self.h, block_rows):
+            v = np.arange(v0, min(v0 + block_rows, self.h), dtype=np.float32)
+            pix = np.stack(np.meshgrid(u, v), axis=-1)
+            block = self.unproject(pix, 1.0, dtype=np.float32)
+            if depth:
+                block = block / block[..., 2:3]
+            rays[v0:v0 + len(v)] = block
+
+        if cache_path is not None:
+            rays.flush()
+            os.replace(tmp_path, cache_path)
+            tmp_key_path = self._temporary_file(cache_path)
+            np.save(tmp_key_path, key)
+            os.replace(tmp_key_path, key_path)
+        self.ray_tables[memory_key] = rays
+        return rays
+
+    @staticmethod
+    def _temporary_file(cache_path):
+        """Create an empty .npy file with a unique name next to cache_path and return its path"""
+        fd, path = tempfile.mkstemp(suffix='.npy', dir=os.path.dirname(os.path.abspath(cache_path)))
+        os.close(fd)
+        return path
+
+    def unproject_depth(self, depth_map, distance=False, cache_path=None):
+        '''
+        Inputs:
+        - depth_map, array of shape (h, w) with the depth (z) of each pixel
+        - distance, if True depth_map holds the distance to the camera origin instead of the depth
+        - cache_path, optional .npy file for the memory mapped ray table
+        Outputs:
+        - points, float32 array of shape (h, w, 3), use points.reshape(-1, 3) for a point list
+        '''
+        rays = self.ray_table(depth=not distance, cache_path=cache_path)
+        return np.asarray(depth_map, dtype=np.float32)[..., None] * rays
+
+    def render_depth(self, points, pose):
+        '''
+        Inputs:
+        - points, 3D points in world coordinates, array of shape (N, 3)
+        - pose, transform from the camera to world coordinates, matrix of shape (3,4)
+        Outputs:
+        - depth_map, depth (z) of the closest point in each pixel, array of shape (h, w), 0 where no point projects
+        - index_map, index into points of the closest point in each pixel, array of shape (h, w), -1 where no point projects
+        '''
+        ## Transform all points into the camera and keep those in front of it
+        world_to_cam = compute_relative_pose(np.eye(3, 4), pose)
+        pts_cam = points @ world_to_cam[:, :3].T + world_to_cam[:, 3]
+        idx = np.flatnonzero(pts_cam[:, 2] > 0)
+
+        ## Project all points at once and discard those outside w x h
+        pix = np.round(self.project(pts_cam[idx])).astype(np.int64)
+        inside = (pix[:, 0] >= 0) & (pix[:, 0] < self.w) & (pix[:, 1] >= 0) & (pix[:, 1] < self.h)
+        idx, pix = idx[inside], pix[inside]
+        depth = pts_cam[idx, 2]
+        pixel_id = pix[:, 1] * self.w + pix[:, 0]
+
+        ## Z-buffer: sort by pixel, then by depth, and keep the first point of every pixel
+        order = np.lexsort((depth, pixel_id))
+        pixel_id = pixel_id[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = pixel_id[1:] != pixel_id[:-1]
+        winners = order[first]
+
+        depth_map = np.zeros(self.h * self.w)
+        index_map = np.full(self.h * self.w, -1, dtype=np.int64)
+        depth_map[pixel_id[first]] = depth[winners]
+        index_map[pixel_id[first]] = idx[winners]
+        return depth_map.reshape(self.h, self.w), index_map.reshape(self.h, self.w)
+
 
 class Pinhole(Camera):
 
     def __init__(self, w, h, fx, fy, cx, cy):
         Camera.__init__(self, w, h)
         self.K = np.array([[fx, 0, cx], [0, fy, cy], [0, 0, 1]])
+        self.K_inv = np.linalg.inv(self.K)
 
-    def project(self, pt):
+    def project(self, pt, dtype=np.float64):
         '''
         Inputs:
-        - pt, vector of size 3
+        - pt, vector of size 3 or array of points of shape (N, 3)
+        - dtype, floating point type of the computation, e.g. np.float32 for large point clouds
         Outputs:
-        - pix, projection of pt using the pinhole model, vector of size 2
+        - pix, projection of pt using the pinhole model, vector of size 2 or array of shape (N, 2)
         '''
         ########################################################################
         # TODO:                                                                #
         # project the point pt, considering the pinhole model.                 #
         ########################################################################
 
-        X, Y, Z = pt[0], pt[1], pt[2]
-        
-        ## Perspective projection
-        x_norm = X / Z
-        y_norm = Y / Z
-        
-        ## apply intrinsic matrix
-        u = self.K[0, 0] * x_norm + self.K[0, 2]
-        v = self.K[1, 1] * y_norm + self.K[1, 2]
+        pts = np.asarray(pt, dtype=dtype)
 
-        pix = np.array([u, v])
+        ## apply intrinsic matrix to all points at once: (N, 3) @ K^T
+        proj = pts @ self.K.T.astype(dtype)
+
+        ## Perspective projection
+        pix = proj[..., :2] / proj[..., 2:3]
 
         ########################################################################
         #                           END OF YOUR CODE                           #
@@ -81,13 +286,32 @@ class Pinhole(Camera):
 
         return pix
 
-    def unproject(self, pix, d):
+    def project_jacobian(self, pt):
         '''
         Inputs:
-        - pix, vector of size 2
-        - d, scalar 
+        - pt, array of points of shape (N, 3)
         Outputs:
-        - final_pt, obtained by unprojecting pix with the distance d using the pinhole model, vector of size 3
+        - J, derivative of project with respect to pt, array of shape (N, 2, 3)
+        '''
+        pts = np.asarray(pt, dtype=np.float64)
+        X, Y, Z = pts[..., 0], pts[..., 1], pts[..., 2]
+        fx, fy = self.K[0, 0], self.K[1, 1]
+
+        J = np.zeros(pts.shape[:-1] + (2, 3))
+        J[..., 0, 0] = fx / Z
+        J[..., 0, 2] = -fx * X / Z**2
+        J[..., 1, 1] = fy / Z
+        J[..., 1, 2] = -fy * Y / Z**2
+        return J
+
+    def unproject(self, pix, d, dtype=np.float64):
+        '''
+        Inputs:
+        - pix, vector of size 2 or array of pixels of shape (N, 2)
+        - d, scalar or array of distances of shape (N,)
+        - dtype, floating point type of the computation, e.g. np.float32 for large point clouds
+        Outputs:
+        - final_pt, obtained by unprojecting pix with the distance d using the pinhole model, vector of size 3 or array of shape (N, 3)
         '''
         ########################################################################
         # TODO:                                                                #
@@ -96,21 +320,17 @@ class Pinhole(Camera):
         # the desired point, not the depth.                                    #
         ########################################################################
 
-        u, v = pix[0], pix[1]
-        
-        f_x, f_y = self.K[0, 0], self.K[1, 1]
-        c_x, c_y = self.K[0, 2], self.K[1, 2]
-        
-        # Compute normalized coordinates
-        x_norm = (u - c_x) / f_x
-        y_norm = (v - c_y) / f_y
-        
-        direction = np.array([x_norm, y_norm, 1.0])
+        pix = np.asarray(pix, dtype=dtype)
+        d = np.asarray(d, dtype=dtype)
+
+        # Compute normalized coordinates [x_norm, y_norm, 1] = K^-1 [u, v, 1]
+        K_inv = self.K_inv.astype(dtype)
+        direction = pix @ K_inv[:, :2].T + K_inv[:, 2]
         
-        direction_nrom = np.linalg.norm(direction)
+        direction_nrom = np.linalg.norm(direction, axis=-1, keepdims=True)
         direction = direction / direction_nrom
         
-        final_pt = d * direction
+        final_pt = d[..., None] * direction
         
         ########################################################################
         #                           END OF YOUR CODE                           #
@@ -123,60 +343,46 @@ class Fov(Camera):
     def __init__(self, w, h, fx, fy, cx, cy, W):
         Camera.__init__(self, w, h)
         self.K = np.array([[fx, 0, cx], [0, fy, cy], [0, 0, 1]])
+        self.K_inv = np.linalg.inv(self.K)
         self.W = W
 
-    def project(self, pt):
+        # Based on Devernay-Faugeras FOV model, W is the full FOV, omega is half-angle.
+        # The constants of the distortion are computed once per camera; when W ≈ 0
+        # the model degenerates to the pinhole model.
+        # Python scalars, so that float32 inputs stay float32
+        is_pinhole, tan_omega, inv_W = fov_constants(self.W)
+        self.is_pinhole = bool(is_pinhole)
+        self.tan_omega = float(tan_omega)
+        self.inv_W = float(inv_W)
+        self.inv_2tan_omega = 0.0 if self.is_pinhole else 1.0 / (2.0 * self.tan_omega)
+
+    def intrinsics(self):
+        return np.append(np.ravel(self.K), self.W)
+
+    def project(self, pt, dtype=np.float64):
         '''
         Inputs:
-        - pt, vector of size 3
+        - pt, vector of size 3 or array of points of shape (N, 3)
+        - dtype, floating point type of the computation, e.g. np.float32 for large point clouds
         Outputs:
-        - pix, projection of pt using the Fov model, vector of size 2
+        - pix, projection of pt using the Fov model, vector of size 2 or array of shape (N, 2)
         '''
         ########################################################################
         # TODO:                                                                #
         # project the point pt, considering the Fov model.                     #
         ########################################################################
 
-        X, Y, Z = pt[0], pt[1], pt[2]
+        pts = np.asarray(pt, dtype=dtype)
         
         # Step 1: Convert to normalized coordinates (divide by Z)
-        x_n = X / Z
-        y_n = Y / Z
-        
-        # Step 2: Calculate undistorted radius in normalized coordinates
-        ru = np.sqrt(x_n**2 + y_n**2)
-        
-        # Step 3: Apply FOV distortion model
-        # Based on Devernay-Faugeras FOV model: rd = (1/ω) * arctan(2 * ru * tan(ω/2))
-        omega = self.W / 2.0  # W is the full FOV, omega is half-angle
-        
-        if abs(omega) < 1e-8:
-            # When W ≈ 0, use pinhole model
-            rd = ru
-        else:
-            # FOV distortion equation
-            if ru < 1e-8:
-                rd = 0.0
-            else:
-                rd = (1.0 / self.W) * np.arctan(2.0 * ru * np.tan(omega))
+        x_n = pts[..., :2] / pts[..., 2:3]
         
-        # Step 4: Apply distortion to normalized coordinates
-        if ru > 1e-8:
-            scale = rd / ru
-            x_d = x_n * scale
-            y_d = y_n * scale
-        else:
-            x_d = 0.0
-            y_d = 0.0
+        # Step 2-4: Apply the FOV distortion to the undistorted radius in normalized coordinates
+        x_d = fov_distort(x_n, self.is_pinhole, self.tan_omega, self.inv_W)
         
         # Step 5: Apply intrinsic matrix to get pixel coordinates
-        fx, fy = self.K[0, 0], self.K[1, 1]
-        cx, cy = self.K[0, 2], self.K[1, 2]
-        
-        u = fx * x_d + cx
-        v = fy * y_d + cy
-        
-        pix = np.array([u, v])
+        K = self.K.astype(dtype)
+        pix = x_d @ K[:2, :2].T + K[:2, 2]
         
         ########################################################################
         #                           END OF YOUR CODE                           #
@@ -184,13 +390,49 @@ class Fov(Camera):
 
         return pix
 
-    def unproject(self, pix, d):
+    def project_jacobian(self, pt):
         '''
         Inputs:
-        - pix, vector of size 2
-        - d, scalar 
+        - pt, array of points of shape (N, 3)
         Outputs:
-        - final_pt, obtained by unprojecting pix with the distance d using the Fov model, vector of size 3
+        - J, derivative of project with respect to pt, array of shape (N, 2, 3)
+        '''
+        pts = np.asarray(pt, dtype=np.float64)
+        Z = pts[..., 2]
+        x_n = pts[..., :2] / pts[..., 2:3]
+        ru = np.linalg.norm(x_n, axis=-1)
+
+        # pix = f * s(ru) * x_n + c with s = rd / ru, so
+        # d pix / d x_n = f * (s * I + s'(ru) / ru * x_n x_n^T)
+        valid = ru > 1e-8
+        ru_safe = np.where(valid, ru, 1.0)
+        if self.is_pinhole:
+            s = np.ones_like(ru)
+            ds_over_ru = np.zeros_like(ru)
+        else:
+            rd = np.arctan(2.0 * ru * self.tan_omega) * self.inv_W
+            drd = 2.0 * self.tan_omega * self.inv_W / (1.0 + 4.0 * ru**2 * self.tan_omega**2)
+            # s is even in ru, so s'(ru) / ru stays bounded on the optical axis
+            s = np.where(valid, rd / ru_safe, 2.0 * self.tan_omega * self.inv_W)
+            ds_over_ru = np.where(valid, (drd * ru - rd) / ru_safe**3, 0.0)
+        J_distort = s[..., None, None] * np.eye(2) + ds_over_ru[..., None, None] * x_n[..., :, None] * x_n[..., None, :]
+
+        # d x_n / d pt
+        J_norm = np.zeros(pts.shape[:-1] + (2, 3))
+        J_norm[..., 0, 0] = 1.0 / Z
+        J_norm[..., 1, 1] = 1.0 / Z
+        J_norm[..., :, 2] = -x_n / Z[..., None]
+
+        return np.diag([self.K[0, 0], self.K[1, 1]]) @ J_distort @ J_norm
+
+    def unproject(self, pix, d, dtype=np.float64):
+        '''
+        Inputs:
+        - pix, vector of size 2 or array of pixels of shape (N, 2)
+        - d, scalar or array of distances of shape (N,)
+        - dtype, floating point type of the computation, e.g. np.float32 for large point clouds
+        Outputs:
+        - final_pt, obtained by unprojecting pix with the distance d using the Fov model, vector of size 3 or array of shape (N, 3)
         '''
         ########################################################################
         # TODO:                                                                #
@@ -199,58 +441,93 @@ class Fov(Camera):
         # the desired point, not the depth.                                    #
         ########################################################################
 
-        u, v = pix[0], pix[1]
-        
-        # Extract intrinsic parameters
-        fx, fy = self.K[0, 0], self.K[1, 1]
-        cx, cy = self.K[0, 2], self.K[1, 2]
+        pix = np.asarray(pix, dtype=dtype)
+        d = np.asarray(d, dtype=dtype)
         
         # Step 1: Convert to normalized coordinates
-        x_d = (u - cx) / fx
-        y_d = (v - cy) / fy
+        K_inv = self.K_inv.astype(dtype)
+        x_d = pix @ K_inv[:2, :2].T + K_inv[:2, 2]
         
         # Step 2: Calculate distorted radius
-        rd = np.sqrt(x_d**2 + y_d**2)
+        rd = np.linalg.norm(x_d, axis=-1, keepdims=True)
         
         # Step 3: Apply inverse FOV distortion
-        # Based on Devernay-Faugeras FOV model: ru = tan(rd * ω) / (2 * tan(ω/2))
-        omega = self.W / 2.0  # W is the full FOV, omega is half-angle
-        
-        if abs(omega) < 1e-8:
-            # When W ≈ 0, use pinhole model
-            ru = rd
-        else:
-            # Inverse FOV distortion equation
-            if abs(rd) < 1e-8:
-                ru = 0.0
-            else:
-                ru = np.tan(rd * self.W) / (2.0 * np.tan(omega)) # Use self.W in numerator's tan, omega in denominator's tan
+        # ru = tan(rd * ω) / (2 * tan(ω/2)), or ru = rd for the pinhole case
+        ru = np.where(self.is_pinhole, rd, np.tan(rd * self.W) * self.inv_2tan_omega)
         
         # Step 4: Convert back to undistorted normalized coordinates
-        if rd > 1e-8:
-            scale = ru / rd
-            x_n = x_d * scale
-            y_n = y_d * scale
-        else:
-            x_n = 0.0
-            y_n = 0.0
+        valid = rd > 1e-8
+        scale = np.where(valid, ru / np.where(valid, rd, 1.0), 0.0)
+        x_n = x_d * scale
         
         # Step 5: Create 3D ray direction vector
         # For pinhole model: ray = [x_n, y_n, 1]
-        direction = np.array([x_n, y_n, 1.0])
+        direction = np.concatenate((x_n, np.ones_like(rd)), axis=-1)
         
         # Step 6: CRITICAL - Normalize the ray direction before scaling
-        direction_norm = np.linalg.norm(direction)
-        if direction_norm > 1e-8:
-            unit_direction = direction / direction_norm
-        else:
-            unit_direction = np.array([0.0, 0.0, 1.0])
+        # (the norm is at least one because of the last component)
+        unit_direction = direction / np.linalg.norm(direction, axis=-1, keepdims=True)
         
         # Step 7: Scale the normalized direction by the specified distance
-        final_pt = d * unit_direction
+        final_pt = d[..., None] * unit_direction
         
 
         ########################################################################
         #                           END OF YOUR CODE                           #
         ########################################################################        
         return final_pt
+
+
+class CameraBatch:
+    '''
+    Intrinsics of many Pinhole and Fov cameras stored as contiguous arrays,
+    so that points can be projected into all cameras with one broadcast.
+    A Pinhole camera is stored as a Fov camera with W = 0.
+    '''
+
+    def __init__(self, cameras):
+        '''
+        Inputs:
+        - cameras, list of C Pinhole or Fov cameras
+        '''
+        self.w = np.array([cam.w for cam in cameras])
+        self.h = np.array([cam.h for cam in cameras])
+        self.K = np.stack([cam.K for cam in cameras]).astype(np.float64)
+        self.W = np.array([getattr(cam, 'W', 0.0) for cam in cameras], dtype=np.float64)
+
+        # same per-camera constants as in Fov, pinhole cameras use rd = ru
+        self.is_pinhole, self.tan_omega, self.inv_W = fov_constants(self.W)
+
+    def __len__(self):
+        return len(self.W)
+
+    def project(self, points, poses):
+        '''
+        Inputs:
+        - points, 3D points in world coordinates, array of shape (N, 3)
+        - poses, transforms from cam_i to world coordinates, array of shape (C, 3, 4)
+        Outputs:
+        - pix, projection of every point into every camera, array of shape (C, N, 2)
+        - visible, whether the point is in front of the camera and inside its image, array of shape (C, N)
+        '''
+        ## Transform the points into all cameras at once
+        world_to_cam = world_to_camera_poses(poses)
+        pts_cam = np.einsum('cij,nj->cni', world_to_cam[..., :3], points) + world_to_cam[:, None, :, 3]
+
+        ## Normalized coordinates, guarding points in the camera plane
+        Z = pts_cam[..., 2:3]
+        in_front = Z[..., 0] > 0
+        x_n = pts_cam[..., :2] / np.where(Z == 0, 1.0, Z)
+
+        ## FOV distortion per camera, rd = ru for pinhole cameras
+        x_d = fov_distort(x_n, self.is_pinhole[:, None, None], self.tan_omega[:, None, None], self.inv_W[:, None, None])
+
+        ## Intrinsics
+        f = np.stack((self.K[:, 0, 0], self.K[:, 1, 1]), axis=-1)[:, None]
+        c = self.K[:, :2, 2][:, None]
+        pix = f * x_d + c
+
+        visible = (in_front
+                   & (pix[..., 0] >= 0) & (pix[..., 0] < self.w[:, None])
+                   & (pix[..., 1] >= 0) & (pix[..., 1] < self.h[:, None]))
+        return pix, visible
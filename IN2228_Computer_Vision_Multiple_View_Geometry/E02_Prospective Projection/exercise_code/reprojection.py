@@ -0,0 +1,84 @@
+import numpy as np
+from scipy.sparse import coo_matrix
+
+from exercise_code.camera import world_to_camera_poses
+
+def skew(v):
+    '''
+    Inputs:
+    - v, array of vectors of shape (N, 3)
+    Outputs:
+    - cross product matrices [v]x of shape (N, 3, 3)
+    '''
+    S = np.zeros(v.shape[:-1] + (3, 3))
+    S[..., 0, 1], S[..., 0, 2] = -v[..., 2], v[..., 1]
+    S[..., 1, 0], S[..., 1, 2] = v[..., 2], -v[..., 0]
+    S[..., 2, 0], S[..., 2, 1] = -v[..., 1], v[..., 0]
+    return S
+
+
+def reprojection_residuals(cam, poses, points, cam_idx, point_idx, pix, jacobians=False):
+    '''
+    Inputs:
+    - cam, Pinhole or Fov camera shared by all views
+    - poses, transforms from cam_i to world coordinates, array of shape (M,3,4)
+    - points, 3D points in world coordinates, array of shape (N,3)
+    - cam_idx, camera of each observation, array of shape (K,)
+    - point_idx, point of each observation, array of shape (K,)
+    - pix, observed pixels, array of shape (K,2)
+    - jacobians, whether to also return the analytic Jacobians
+    Outputs:
+    - residuals, projected minus observed pixels, array of shape (K,2)
+    - J_pose, derivative of the residuals with respect to the pose of the
+      observing camera, array of shape (K,2,6), only if jacobians is True.
+      The pose is perturbed as R <- R exp([dtheta]x), T <- T + dt with the
+      parameters ordered as (dtheta, dt).
+    - J_point, derivative of the residuals with respect to the observed
+      point, array of shape (K,2,3), only if jacobians is True
+    '''
+    cam_idx = np.asarray(cam_idx)
+    point_idx = np.asarray(point_idx)
+
+    ## Transform all observed points into their cameras at once
+    world_to_cam = world_to_camera_poses(poses)[cam_idx]
+    R_t = world_to_cam[..., :3]
+    pts_cam = np.einsum('kij,kj->ki', R_t, points[point_idx]) + world_to_cam[..., 3]
+
+    residuals = cam.project(pts_cam) - pix
+    if not jacobians:
+        return residuals
+
+    ## Chain rule through pts_cam = exp(-[dtheta]x) R^T (X - T - dt)
+    J_proj = cam.project_jacobian(pts_cam)
+    J_point = J_proj @ R_t
+    J_pose = np.concatenate((J_proj @ skew(pts_cam), -J_point), axis=-1)
+
+    return residuals, J_pose, J_point
+
+
+def jacobian_to_sparse(J_pose, J_point, cam_idx, point_idx, num_cameras, num_points):
+    '''
+    Inputs:
+    - J_pose, pose blocks of shape (K,2,6) from reprojection_residuals
+    - J_point, point blocks of shape (K,2,3) from reprojection_residuals
+    - cam_idx, camera of each observation, array of shape (K,)
+    - point_idx, point of each observation, array of shape (K,)
+    - num_cameras, number of cameras M
+    - num_points, number of points N
+    Outputs:
+    - J, scipy.sparse.csr_matrix of shape (2K, 6M+3N), the residuals stacked
+      as [r_0, r_1, ...] and the parameters as [pose_0, ..., pose_M-1, point_0, ...]
+    '''
+    K = J_pose.shape[0]
+    cam_idx = np.asarray(cam_idx)
+    point_idx = np.asarray(point_idx)
+    rows = 2 * np.arange(K)[:, None, None] + np.arange(2)[None, :, None]
+
+    pose_cols = 6 * cam_idx[:, None, None] + np.arange(6)[None, None, :]
+    point_cols = 6 * num_cameras + 3 * point_idx[:, None, None] + np.arange(3)[None, None, :]
+
+    data = np.concatenate((J_pose.ravel(), J_point.ravel()))
+    row = np.concatenate((np.broadcast_to(rows, J_pose.shape).ravel(), np.broadcast_to(rows, J_point.shape).ravel()))
+    col = np.concatenate((np.broadcast_to(pose_cols, J_pose.shape).ravel(), np.broadcast_to(point_cols, J_point.shape).ravel()))
+
+    return coo_matrix((data, (row, col)), shape=(2 * K, 6 * num_cameras + 3 * num_points)).tocsr()
@@ -0,0 +1,135 @@
+from functools import lru_cache
+import numpy as np
+from exercise_code.camera import Fov, Pinhole
+
+class UndistortionMap:
+    '''
+    Remap from a Fov camera to a target Pinhole camera. The (h, w, 2) grid of
+    source pixels and the bilinear taps are computed once, so undistorting a
+    frame only gathers and blends the four neighbours of each target pixel.
+    '''
+
+    def __init__(self, fov, pinhole):
+        '''
+        Inputs:
+        - fov, Fov camera that captured the images
+        - pinhole, Pinhole camera describing the undistorted images
+        '''
+        self.src_shape = (fov.h, fov.w)
+        self.dst_shape = (pinhole.h, pinhole.w)
+
+        ## Source pixel of every target pixel: unit ray of the pinhole, projected by the Fov model
+        self.grid = fov.project(pinhole.ray_table(), dtype=np.float32)
+
+        ## Bilinear taps: flat source indices and weights of shape (4, h*w),
+        ## taps outside the source image get weight zero
+        x = self.grid[..., 0].ravel()
+        y = self.grid[..., 1].ravel()
+        x0 = np.floor(x)
+        y0 = np.floor(y)
+        wx = x - x0
+        wy = y - y0
+        x0 = x0.astype(np.int64)
+        y0 = y0.astype(np.int64)
+
+        xs = np.stack((x0, x0 + 1, x0, x0 + 1))
+        ys = np.stack((y0, y0, y0 + 1, y0 + 1))
+        weights = np.stack(((1 - wx) * (1 - wy), wx * (1 - wy), (1 - wx) * wy, wx * wy))
+        inside = (xs >= 0) & (xs < fov.w) & (ys >= 0) & (ys < fov.h)
+
+        self.index = np.where(inside, ys * fov.w + xs, 0)
+        self.weights = np.where(inside, weights, 0).astype(np.float32)
+
+    def matches(self, shape, batched):
+        '''
+        Inputs:
+        - shape, shape of the Fov image(s)
+        - batched, whether shape should be (B, h, w) or (B, h, w, C) rather than (h, w) or (h, w, C)
+        Outputs:
+        - True if shape has that layout and the Fov image size
+        '''
+        shape = tuple(shape)
+        start = int(batched)
+        return 2 <= len(shape) - start <= 3 and shape[start:start + 2] == self.src_shape
+
+    def is_batched(self, shape):
+        '''
+        Inputs:
+        - shape, shape of the Fov image(s)
+        Outputs:
+        - batched, whether shape is (B, h, w) or (B, h, w, C) rather than (h, w) or (h, w, C)
+        A 3D shape matching both layouts, e.g. (32, 32, 32) for a 32 x 32 sensor, raises a ValueError.
+        '''
+        single = self.matches(shape, False)
+        batch = self.matches(shape, True)
+        if single and batch:
+            raise ValueError(f"images of shape {shape} may be one image or a batch, pass batched explicitly")
+        if not single and not batch:
+            raise ValueError(f"images of shape {shape} do not match the Fov image size {self.src_shape}")
+        return batch
+
+    def apply(self, images, batched=None):
+        '''
+        Inputs:
+        - images, Fov image(s) of shape (h, w), (h, w, C), (B, h, w) or (B, h, w, C)
+        - batched, whether images holds a batch, None to decide from the shape
+        Outputs:
+        - undistorted image(s) with the pinhole resolution and the same layout and dtype
+        '''
+        images = np.asarray(images)
+        if batched is None:
+            batched = self.is_batched(images.shape)
+        elif not self.matches(images.shape, batched):
+            raise ValueError(f"images of shape {images.shape} do not match the Fov image size {self.src_shape}")
+        flat = images if batched else images[None]
+        B, channels = flat.shape[0], flat.shape[3:]
+        flat = flat.reshape((B, -1) + channels)
+
+        ## Gather the four taps of every target pixel and blend them
+        weights = self.weights.reshape(self.weights.shape + (1,) * len(channels))
+        out = np.zeros((B, self.index.shape[1]) + channels, dtype=np.float32)
+        for tap in range(4):
+            out += weights[tap] * flat[:, self.index[tap]]
+
+        out = out.reshape((B,) + self.dst_shape + channels)
+        if not batched:
+            out = out[0]
+        if np.issubdtype(images.dtype, np.integer):
+            info = np.iinfo(images.dtype)
+            out = np.clip(np.rint(out), info.min, info.max)
+        return out.astype(images.dtype)
+
+
+@lru_cache(maxsize=8)
+def _build_undistortion_map(fov_params, pinhole_params):
+    # cameras are rebuilt from their parameters, so the cache is keyed by value and holds no camera
+    return UndistortionMap(Fov(*fov_params), Pinhole(*pinhole_params))
+
+
+def get_undistortion_map(fov, pinhole):
+    '''
+    Inputs:
+    - fov, Fov camera that captured the images
+    - pinhole, Pinhole camera describing the undistorted images
+    Outputs:
+    - UndistortionMap, built on the first call and reused for cameras with the same intrinsics and W,
+      the least recently used maps are dropped once more than 8 are cached
+    '''
+    def params(cam):
+        K = cam.K
+        return (cam.w, cam.h, float(K[0, 0]), float(K[1, 1]), float(K[0, 2]), float(K[1, 2]))
+
+    return _build_undistortion_map(params(fov) + (float(fov.W),), params(pinhole))
+
+
+def undistort(images, fov, pinhole, batched=None):
+    '''
+    Inputs:
+    - images, Fov image(s) of shape (h, w), (h, w, C), (B, h, w) or (B, h, w, C)
+    - fov, Fov camera that captured the images
+    - pinhole, Pinhole camera describing the undistorted images
+    - batched, whether images holds a batch, None to decide from the shape
+    Outputs:
+    - undistorted image(s) with the pinhole resolution and the same layout and dtype
+    '''
+    return get_undistortion_map(fov, pinhole).apply(images, batched)
@@ -0,0 +1,149 @@
+import numpy as np
+
+from exercise_code.camera import compute_relative_pose
+
+class VisibilityIndex:
+    '''
+    Coarse voxel grid over a static point cloud. A query first culls whole
+    cells against the view frustum of a Pinhole camera and only transforms
+    and projects the points of the surviving cells.
+    The cells are the leaves of an octree: level l groups the cells by their
+    coordinates divided by 2^l, so whole blocks outside the frustum are culled
+    without visiting their cells.
+    '''
+
+    def __init__(self, points, cell_size):
+        '''
+        Inputs:
+        - points, 3D points in world coordinates, array of shape (N, 3)
+        - cell_size, edge length of the cubic grid cells
+        '''
+        self.points = np.asarray(points, dtype=np.float64)
+        self.cell_size = cell_size
+
+        cell_coords = np.floor(self.points / cell_size).astype(np.int64)
+        cells, inverse, counts = np.unique(cell_coords, axis=0, return_inverse=True, return_counts=True)
+
+        ## Number of octree levels above the cells, until the blocks span at most 2 x 2 x 2
+        depth = 0
+        if len(cells):
+            low, high = cells.min(axis=0), cells.max(axis=0)
+            while np.any((high >> depth) - (low >> depth) > 1):
+                depth += 1
+
+        ## Order the cells by their block at every level, coarsest first, so each block owns a contiguous range
+        keys = [cells[:, axis] >> level for level in range(depth + 1) for axis in (2, 1, 0)]
+        cell_order = np.lexsort(keys)
+        cells, counts = cells[cell_order], counts[cell_order]
+        cell_rank = np.empty_like(cell_order)
+        cell_rank[cell_order] = np.arange(len(cell_order))
+
+        ## Sort the points by cell, each cell owns the range order[starts[k]:starts[k] + counts[k]]
+        self.order = np.argsort(cell_rank[inverse.ravel()], kind='stable')
+        self.starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        self.counts = counts
+        self.centers = (cells + 0.5) * cell_size
+
+        ## Blocks of level l own the range [child_starts[l][k], child_starts[l][k] + child_counts[l][k])
+        ## of the blocks of level l - 1, level 0 being the cells
+        self.block_centers = [self.centers]
+        self.child_starts = [None]
+        self.child_counts = [None]
+        coords = cells
+        for level in range(1, depth + 1):
+            parents = coords >> 1
+            first = np.flatnonzero(np.concatenate(([True], np.any(parents[1:] != parents[:-1], axis=1))))
+            coords = parents[first]
+            self.block_centers.append((coords + 0.5) * (cell_size * 2**level))
+            self.child_starts.append(first)
+            self.child_counts.append(np.diff(np.append(first, len(parents))))
+
+    def frustum_planes(self, cam, pose, near=1e-6, far=None):
+        '''
+        Inputs:
+        - cam, Pinhole camera
+        - pose, transform from the camera to world coordinates, matrix of shape (3,4)
+        - near, far, distances of the near and (optional) far clipping planes
+        Outputs:
+        - normals, inward unit normals of the frustum planes in world coordinates, array of shape (P, 3)
+        - offsets, plane offsets such that inside points satisfy normals @ x >= offsets, array of shape (P,)
+        '''
+        ## Rays through the image corners, in camera coordinates
+        corners = np.array([[0, 0], [cam.w, 0], [cam.w, cam.h], [0, cam.h]], dtype=np.float64)
+        rays = np.hstack((corners, np.ones((4, 1)))) @ np.linalg.inv(cam.K).T
+
+        ## Side planes through the camera center, plus near and far planes
+        normals = np.cross(rays, np.roll(rays, -1, axis=0))
+        normals = np.vstack((normals, [0, 0, 1]))
+        offsets = np.array([0, 0, 0, 0, near], dtype=np.float64)
+        if far is not None:
+            normals = np.vstack((normals, [0, 0, -1]))
+            offsets = np.append(offsets, -far)
+        norm = np.linalg.norm(normals, axis=1)
+        normals, offsets = normals / norm[:, None], offsets / norm
+
+        ## Transform the planes into world coordinates: n_w = R n, d_w = d + n_w . T
+        R, T = pose[:, :3], pose[:, 3]
+        normals = normals @ R.T
+        offsets = offsets + normals @ T
+        return normals, offsets
+
+    def query(self, cam, pose, near=1e-6, far=None):
+        '''
+        Inputs:
+        - cam, Pinhole camera
+        - pose, transform from the camera to world coordinates, matrix of shape (3,4)
+        - near, far, distances of the near and (optional) far clipping planes
+        Outputs:
+        - idx, indices of the visible points, array of shape (M,)
+        - pix, projection of the visible points, array of shape (M, 2)
+        '''
+        normals, offsets = self.frustum_planes(cam, pose, near, far)
+
+        ## Descend the octree, only the children of surviving blocks are tested
+        top = len(self.block_centers) - 1
+        blocks = np.arange(len(self.block_centers[top]))
+        for level in range(top, 0, -1):
+            blocks = self.cull(level, blocks, normals, offsets)
+            blocks = expand_ranges(self.child_starts[level][blocks], self.child_counts[level][blocks])
+        cells = self.cull(0, blocks, normals, offsets)
+
+        ## Gather the points of the surviving cells
+        idx = self.order[expand_ranges(self.starts[cells], self.counts[cells])]
+
+        ## Exact test on the remaining points only
+        world_to_cam = compute_relative_pose(np.eye(3, 4), pose)
+        pts_cam = self.points[idx] @ world_to_cam[:, :3].T + world_to_cam[:, 3]
+        in_front = pts_cam[:, 2] > near
+        if far is not None:
+            in_front &= pts_cam[:, 2] <= far
+        idx, pts_cam = idx[in_front], pts_cam[in_front]
+
+        pix = cam.project(pts_cam)
+        inside = (pix[:, 0] >= 0) & (pix[:, 0] < cam.w) & (pix[:, 1] >= 0) & (pix[:, 1] < cam.h)
+        return idx[inside], pix[inside]
+
+    def cull(self, level, blocks, normals, offsets):
+        '''
+        Inputs:
+        - level, octree level of the blocks, 0 for the cells
+        - blocks, indices of the blocks to test, array of shape (K,)
+        - normals, offsets, frustum planes as returned by frustum_planes
+        Outputs:
+        - blocks, the blocks that are not entirely outside the frustum
+        '''
+        ## A block is outside if it lies entirely on the outer side of any plane
+        radius = 0.5 * self.cell_size * 2**level * np.abs(normals).sum(axis=1)
+        distance = self.block_centers[level][blocks] @ normals.T - offsets
+        return blocks[np.all(distance >= -radius, axis=1)]
+
+
+def expand_ranges(starts, counts):
+    '''
+    Inputs:
+    - starts, counts, ranges [starts[k], starts[k] + counts[k]), arrays of shape (K,)
+    Outputs:
+    - indices, concatenation of all ranges, array of shape (counts.sum(),)
+    '''
+    first = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return first + np.arange(counts.sum())
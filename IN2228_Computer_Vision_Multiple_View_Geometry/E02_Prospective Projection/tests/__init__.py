@@ -2,4 +2,9 @@
 from .test_pinhole import test_pinhole
 from .test_fov import test_fov
 from .test_reprojection import test_reprojection
-from .test_relative_pose import test_relative_pose
\ No newline at end of file
+from .test_relative_pose import test_relative_pose
+from .test_depth_unprojection import test_depth_unprojection
+from .test_render_depth import test_render_depth
+from .test_undistort import test_undistort
+from .test_camera_batch import test_camera_batch
+from .test_visibility import test_visibility
\ No newline at end of file
@@ -0,0 +1,51 @@
+import numpy as np
+from .base_tests import UnitTest, CompositeTest, test_results_to_score
+
+from exercise_code.camera import *
+from scipy.spatial.transform import Rotation
+
+class CameraBatchProject(UnitTest):
+    def __init__(self) -> None:
+        self.cameras = [
+            Pinhole(640, 480, 600, 600, 320, 240),
+            Fov(640, 480, 600, 600, 320, 240, 0.1),
+            Fov(320, 240, 300, 310, 160, 120, 0.9),
+            Pinhole(100, 80, 90, 95, 50, 40),
+        ]
+        rotations = Rotation.from_rotvec(0.3 * np.random.randn(4, 3)).as_matrix()
+        self.poses = np.concatenate((rotations, np.random.randn(4, 3, 1)), axis=-1)
+        self.points = np.random.uniform(-3, 3, (500, 3)) + np.array([0, 0, 3])
+        self.output = None
+    def test(self):
+        batch = CameraBatch(self.cameras)
+        pix, visible = batch.project(self.points, self.poses)
+        self.output = pix
+        if pix.shape != (4, 500, 2) or visible.shape != (4, 500):
+            return False
+
+        # reference: one camera at a time
+        for c, cam in enumerate(self.cameras):
+            relative_pose = compute_relative_pose(np.eye(3, 4), self.poses[c])
+            pts_cam = self.points @ relative_pose[:, :3].T + relative_pose[:, 3]
+            ref = cam.project(pts_cam)
+            ref_visible = (pts_cam[:, 2] > 0) & (ref[:, 0] >= 0) & (ref[:, 0] < cam.w) & (ref[:, 1] >= 0) & (ref[:, 1] < cam.h)
+            if not (np.array_equal(visible[c], ref_visible) and np.allclose(pix[c, ref_visible], ref[ref_visible])):
+                return False
+        return visible.any()
+
+    def define_success_message(self):
+        return f"Congratulations: You passed the test case for the camera batch projection."
+
+    def define_failure_message(self):
+        return f"The output of the camera batch projection is incorrect (got {self.output})."
+
+
+class CameraBatchTest(CompositeTest):
+    def define_tests(self):
+        return [
+            CameraBatchProject()
+        ]
+
+def test_camera_batch():
+    test = CameraBatchTest()
+    return test_results_to_score(test())
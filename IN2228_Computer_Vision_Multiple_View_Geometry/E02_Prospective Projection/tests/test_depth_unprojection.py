@@ -0,0 +1,107 @@
+import os
+import tempfile
+import numpy as np
+from .base_tests import UnitTest, CompositeTest, test_results_to_score
+
+from exercise_code.camera import *
+
+class DepthUnprojection(UnitTest):
+    def __init__(self, camType) -> None:
+        self.camType = camType
+        self.output = None
+    def test(self):
+        if self.camType == "pinhole":
+            cam = Pinhole(64, 48, 60, 60, 32, 24)
+        else:
+            cam = Fov(64, 48, 60, 60, 32, 24, 0.1)
+        depth_map = np.random.uniform(1, 5, (48, 64))
+        points = cam.unproject_depth(depth_map)
+        distances = cam.unproject_depth(depth_map, distance=True)
+
+        # reference: unproject every pixel on its own
+        v, u = np.mgrid[0:48, 0:64]
+        pix = np.stack((u, v), axis=-1).reshape(-1, 2)
+        ref = np.array([cam.unproject(p, 1.0) for p in pix]).reshape(48, 64, 3)
+        ref_depth = depth_map[..., None] * ref / ref[..., 2:3]
+        ref_distance = depth_map[..., None] * ref
+        self.output = points
+        return (points.shape == (48, 64, 3) and points.dtype == np.float32
+                and np.allclose(points, ref_depth, atol=1e-4)
+                and np.allclose(distances, ref_distance, atol=1e-4)
+                and cam.ray_table() is cam.ray_table())
+
+    def define_success_message(self):
+        return f"Congratulations: You passed the test case for the {self.camType} depth unprojection."
+
+    def define_failure_message(self):
+        return f"The output of the {self.camType} depth unprojection is incorrect (got {self.output})."
+
+
+class RayTableMemoryMap(UnitTest):
+    def __init__(self) -> None:
+        self.output = None
+    def test(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "rays.npy")
+            rays = Pinhole(64, 48, 60, 60, 32, 24).ray_table(cache_path=path, block_rows=5)
+            # a new camera with the same intrinsics reuses the file on disk
+            rays_loaded = Pinhole(64, 48, 60, 60, 32, 24).ray_table(cache_path=path)
+            self.output = rays_loaded
+            result = isinstance(rays_loaded, np.memmap) and np.array_equal(rays, rays_loaded)
+
+            # a different camera model, intrinsics or mode must rebuild the table
+            for cam, depth in [(Pinhole(64, 48, 10, 10, 5, 5), False),
+                               (Fov(64, 48, 60, 60, 32, 24, 0.5), False),
+                               (Pinhole(64, 48, 60, 60, 32, 24), True)]:
+                expected = cam.ray_table(depth=depth)
+                cam.ray_tables.clear()
+                result = result and np.allclose(cam.ray_table(depth=depth, cache_path=path), expected)
+
+            # switching the mode on the same file keeps both tables correct
+            cam = Pinhole(64, 48, 60, 60, 32, 24)
+            depth_map = np.full((48, 64), 2.0)
+            points = cam.unproject_depth(depth_map, cache_path=path)
+            distances = cam.unproject_depth(depth_map, distance=True, cache_path=path)
+            result = (result and np.allclose(points[..., 2], 2.0)
+                      and np.allclose(np.linalg.norm(distances, axis=-1), 2.0)
+                      and np.allclose(cam.unproject_depth(depth_map, cache_path=path)[..., 2], 2.0))
+
+            # a table already in memory is still written to a new cache file
+            rays_memory = cam.ray_table()
+            path_new = os.path.join(tmp, "rays_new.npy")
+            rays_new = cam.ray_table(cache_path=path_new)
+            result = (result and os.path.exists(path_new) and isinstance(rays_new, np.memmap)
+                      and np.array_equal(rays_new, rays_memory))
+
+            # changing the intrinsics after the first call gives a new table
+            cam.K = np.array([[30.0, 0, 16], [0, 30.0, 12], [0, 0, 1]])
+            cam.K_inv = np.linalg.inv(cam.K)
+            expected = Pinhole(64, 48, 30, 30, 16, 12).ray_table()
+            result = (result and np.allclose(cam.ray_table(), expected)
+                      and np.allclose(cam.ray_table(cache_path=path_new), expected))
+
+            # only the cache files are left in the directory, no temporary files
+            result = result and sorted(os.listdir(tmp)) == ["rays.npy", "rays.npy.key.npy",
+                                                             "rays_new.npy", "rays_new.npy.key.npy"]
+            del rays, rays_loaded, expected, points, distances, rays_memory, rays_new
+            cam.ray_tables.clear()
+        return result
+
+    def define_success_message(self):
+        return f"Congratulations: You passed the test case for the memory mapped ray table."
+
+    def define_failure_message(self):
+        return f"The memory mapped ray table is incorrect (got {self.output})."
+
+
+class DepthUnprojectionTest(CompositeTest):
+    def define_tests(self):
+        return [
+            DepthUnprojection("pinhole"),
+            DepthUnprojection("FOV"),
+            RayTableMemoryMap()
+        ]
+
+def test_depth_unprojection():
+    test = DepthUnprojectionTest()
+    return test_results_to_score(test())
@@ -49,11 +49,39 @@ class FovUnproject(UnitTest):
     
 
 
+class FovVectorized(UnitTest):
+    def __init__(self) -> None:
+        data = np.load("data/data.npz")
+        self.ref_points = data["points2project_2"]
+        self.distances = data["distances"]
+        self.ref_pix = data["pixels"]
+        self.output = None
+    def test(self):
+        cam = Fov(640, 480, 600, 600, 320, 240, 0.1)
+        pix = cam.project(self.ref_points)
+        points = cam.unproject(self.ref_pix, self.distances)
+        self.output = (pix, points)
+        if not (np.allclose(pix, self.ref_pix) and np.allclose(points, self.ref_points)):
+            return False
+        # points on the optical axis and a zero FOV camera
+        center = cam.project(np.array([[0.0, 0.0, 2.0]]))
+        pinhole = Fov(640, 480, 600, 600, 320, 240, 0.0)
+        return (np.allclose(center, [[320, 240]])
+                and np.allclose(pinhole.project(self.ref_points), Pinhole(640, 480, 600, 600, 320, 240).project(self.ref_points)))
+
+    def define_success_message(self):
+        return f"Congratulations: You passed the test case for the vectorized FOV projection."
+
+    def define_failure_message(self):
+        return f"The output of the vectorized FOV projection is incorrect (expected {self.ref_pix} and {self.ref_points}, got {self.output})."
+
+
 class FovTest(CompositeTest):
     def define_tests(self):
         return [
             FovProject(),
-            FovUnproject()
+            FovUnproject(),
+            FovVectorized()
         ]
 
 
@@ -49,11 +49,35 @@ class PinholeUnproject(UnitTest):
     
 
 
+class PinholeVectorized(UnitTest):
+    def __init__(self) -> None:
+        data = np.load("data/data.npz")
+        self.ref_points = data["points2project_1"]
+        self.distances = data["distances"]
+        self.ref_pix = data["pixels"]
+        self.output = None
+    def test(self):
+        cam = Pinhole(640, 480, 600, 600, 320, 240)
+        pix = cam.project(self.ref_points)
+        points = cam.unproject(self.ref_pix, self.distances)
+        pix_32 = cam.project(self.ref_points, dtype=np.float32)
+        self.output = (pix, points)
+        return (np.allclose(pix, self.ref_pix) and np.allclose(points, self.ref_points)
+                and pix_32.dtype == np.float32 and np.allclose(pix_32, self.ref_pix, atol=1e-2))
+
+    def define_success_message(self):
+        return f"Congratulations: You passed the test case for the vectorized pinhole projection."
+
+    def define_failure_message(self):
+        return f"The output of the vectorized pinhole projection is incorrect (expected {self.ref_pix} and {self.ref_points}, got {self.output})."
+
+
 class PinholeTest(CompositeTest):
     def define_tests(self):
         return [
             PinholeProject(),
-            PinholeUnproject()
+            PinholeUnproject(),
+            PinholeVectorized()
         ]
 
 
@@ -1,5 +1,5 @@
 import numpy as np
-from .base_tests import UnitTest, test_results_to_score
+from .base_tests import UnitTest, CompositeTest, test_results_to_score
 
 from exercise_code.camera import *
 
@@ -22,7 +22,40 @@ class RelativePose(UnitTest):
         return f"The output of the relative pose is incorrect (expected {self.relative_pose}, got {self.output})."
 
 
+class RelativePoseBatched(UnitTest):
+    def __init__(self) -> None:
+        data = np.load("data/data.npz")
+        self.poses = np.stack((data["pose_1"], data["pose_2"], data["pose_2"] @ np.diag([1, -1, -1, 1])))
+        self.relative_pose = data["relative_pose"]
+        self.output = None
+    def test(self):
+        N = self.poses.shape[0]
+        all_poses = compute_all_relative_poses(self.poses)
+        pair_poses = compute_all_relative_poses(self.poses, pairs=[[2, 0], [0, 1]])
+        self.output = all_poses[0, 1]
+        for i in range(N):
+            for j in range(N):
+                if not np.allclose(all_poses[i, j], compute_relative_pose(self.poses[i], self.poses[j])):
+                    return False
+        return (np.allclose(all_poses[0, 1], self.relative_pose)
+                and np.allclose(pair_poses, all_poses[[2, 0], [0, 1]])
+                and np.allclose(compute_relative_poses(self.poses, self.poses[::-1]), all_poses[np.arange(N), np.arange(N)[::-1]]))
+
+    def define_success_message(self):
+        return f"Congratulations: You passed the test case for the batched relative poses."
+
+    def define_failure_message(self):
+        return f"The output of the batched relative poses is incorrect (expected {self.relative_pose}, got {self.output})."
+
+
+class RelativePoseTest(CompositeTest):
+    def define_tests(self):
+        return [
+            RelativePose(),
+            RelativePoseBatched()
+        ]
+
 
 def test_relative_pose():
-    test = RelativePose()
+    test = RelativePoseTest()
     return test_results_to_score(test())
@@ -0,0 +1,54 @@
+import numpy as np
+from .base_tests import UnitTest, CompositeTest, test_results_to_score
+
+from exercise_code.camera import *
+
+class RenderDepth(UnitTest):
+    def __init__(self, camType) -> None:
+        self.camType = camType
+        self.pose = np.hstack((np.eye(3), np.array([[0.1], [-0.2], [0.3]])))
+        self.points = np.random.uniform(-2, 2, (2000, 3)) + np.array([0, 0, 5])
+        # a point occluded by the first one, one behind the camera and one outside the image
+        occluded = self.pose[:, 3] + 2 * (self.points[0] - self.pose[:, 3])
+        self.points = np.vstack((self.points, occluded, [[0, 0, -5]], [[100, 0, 1]]))
+        self.output = None
+    def test(self):
+        if self.camType == "pinhole":
+            cam = Pinhole(64, 48, 60, 60, 32, 24)
+        else:
+            cam = Fov(64, 48, 60, 60, 32, 24, 0.1)
+        depth_map, index_map = cam.render_depth(self.points, self.pose)
+
+        # reference z-buffer, one point at a time
+        ref_depth = np.zeros((48, 64))
+        pts_cam = self.points - self.pose[:, 3]
+        for i, pt in enumerate(pts_cam):
+            if pt[2] <= 0:
+                continue
+            u, v = np.round(cam.project(pt)).astype(int)
+            if 0 <= u < 64 and 0 <= v < 48 and (ref_depth[v, u] == 0 or pt[2] < ref_depth[v, u]):
+                ref_depth[v, u] = pt[2]
+        self.output = depth_map
+        valid = index_map >= 0
+        return (np.allclose(depth_map, ref_depth)
+                and np.array_equal(valid, ref_depth > 0)
+                and np.allclose(pts_cam[index_map[valid], 2], depth_map[valid])
+                and not np.isin([2000, 2001, 2002], index_map).any())
+
+    def define_success_message(self):
+        return f"Congratulations: You passed the test case for the {self.camType} depth rendering."
+
+    def define_failure_message(self):
+        return f"The output of the {self.camType} depth rendering is incorrect (got {self.output})."
+
+
+class RenderDepthTest(CompositeTest):
+    def define_tests(self):
+        return [
+            RenderDepth("pinhole"),
+            RenderDepth("FOV")
+        ]
+
+def test_render_depth():
+    test = RenderDepthTest()
+    return test_results_to_score(test())
@@ -2,6 +2,8 @@ import numpy as np
 from .base_tests import UnitTest, CompositeTest, test_results_to_score
 
 from exercise_code.camera import *
+from exercise_code.reprojection import reprojection_residuals, jacobian_to_sparse
+from scipy.spatial.transform import Rotation
 
 class Reprojection(UnitTest):
     def __init__(self,camType) -> None:
@@ -34,11 +36,72 @@ class Reprojection(UnitTest):
 
 
 
+class ReprojectionJacobian(UnitTest):
+    def __init__(self,camType) -> None:
+        self.camType = camType
+        M, N = 4, 30
+        # small rotations keep the points in front of every camera
+        rotations = Rotation.from_rotvec(0.1 * np.random.randn(M, 3)).as_matrix()
+        self.poses = np.concatenate((rotations, 0.1 * np.random.randn(M, 3, 1)), axis=-1)
+        self.points = np.random.randn(N, 3) + np.array([0, 0, 6])
+        self.cam_idx = np.repeat(np.arange(M), N)
+        self.point_idx = np.tile(np.arange(N), M)
+        self.pix = np.random.uniform(0, 480, (M * N, 2))
+        self.output = None
+    def test(self):
+        if self.camType == "pinhole":
+            cam = Pinhole(640, 480, 600, 600, 320, 240)
+        else:
+            cam = Fov(640, 480, 600, 600, 320, 240, 0.1)
+        residuals, J_pose, J_point = reprojection_residuals(cam, self.poses, self.points, self.cam_idx, self.point_idx, self.pix, jacobians=True)
+
+        # reference residuals, one point at a time
+        for k in range(len(self.cam_idx)):
+            relative_pose = compute_relative_pose(np.eye(3, 4), self.poses[self.cam_idx[k]])
+            ref = cam.project(relative_pose @ np.append(self.points[self.point_idx[k]], 1.0)) - self.pix[k]
+            if not np.allclose(residuals[k], ref):
+                self.output = "residuals"
+                return False
+
+        # finite differences for the first camera and point
+        eps = 1e-6
+        J_pose_num = np.zeros((len(self.cam_idx), 2, 6))
+        J_point_num = np.zeros((len(self.cam_idx), 2, 3))
+        for d in range(6):
+            delta = np.zeros(6)
+            delta[d] = eps
+            poses = self.poses.copy()
+            poses[0, :, :3] = poses[0, :, :3] @ Rotation.from_rotvec(delta[:3]).as_matrix()
+            poses[0, :, 3] += delta[3:]
+            J_pose_num[:, :, d] = (reprojection_residuals(cam, poses, self.points, self.cam_idx, self.point_idx, self.pix) - residuals) / eps
+        for d in range(3):
+            points = self.points.copy()
+            points[0, d] += eps
+            J_point_num[:, :, d] = (reprojection_residuals(cam, self.poses, points, self.cam_idx, self.point_idx, self.pix) - residuals) / eps
+        if not (np.allclose(J_pose[self.cam_idx == 0], J_pose_num[self.cam_idx == 0], atol=1e-3)
+                and np.allclose(J_point[self.point_idx == 0], J_point_num[self.point_idx == 0], atol=1e-3)):
+            self.output = "jacobians"
+            return False
+
+        J = jacobian_to_sparse(J_pose, J_point, self.cam_idx, self.point_idx, 4, 30)
+        self.output = "sparse layout"
+        return J.shape == (2 * len(self.cam_idx), 6 * 4 + 3 * 30) and J.nnz == len(self.cam_idx) * 18 and np.allclose(J[:2, :6].toarray(), J_pose[0])
+
+    def define_success_message(self):
+        return f"Congratulations: You passed the test case for the {self.camType} reprojection residuals and Jacobians."
+
+    def define_failure_message(self):
+        return f"The {self.output} of the {self.camType} reprojection residuals are incorrect."
+
+
+
 class ReprojectionTest(CompositeTest):
     def define_tests(self):
         return [
             Reprojection("pinhole"),
-            Reprojection("FOV")
+            Reprojection("FOV"),
+            ReprojectionJacobian("pinhole"),
+            ReprojectionJacobian("FOV")
         ]
 
 def test_reprojection():
@@ -0,0 +1,123 @@
+import numpy as np
+from .base_tests import UnitTest, CompositeTest, test_results_to_score
+
+from exercise_code.camera import *
+from exercise_code.undistort import undistort, get_undistortion_map, _build_undistortion_map
+
+def bilinear(image, x, y):
+    # reference bilinear sampling of a single pixel, zero outside the image
+    value = 0.0
+    x0, y0 = int(np.floor(x)), int(np.floor(y))
+    for xi, yi in [(x0, y0), (x0 + 1, y0), (x0, y0 + 1), (x0 + 1, y0 + 1)]:
+        if 0 <= xi < image.shape[1] and 0 <= yi < image.shape[0]:
+            value += (1 - abs(x - xi)) * (1 - abs(y - yi)) * image[yi, xi]
+    return value
+
+class Undistortion(UnitTest):
+    def __init__(self) -> None:
+        self.fov = Fov(40, 30, 30, 30, 20, 15, 0.9)
+        self.pinhole = Pinhole(36, 28, 25, 25, 18, 14)
+        self.images = np.random.rand(3, 30, 40).astype(np.float32)
+        self.output = None
+    def test(self):
+        undistorted = undistort(self.images, self.fov, self.pinhole)
+        single = undistort(self.images[1], self.fov, self.pinhole)
+
+        # reference: unproject and project every pixel on its own
+        ref = np.zeros((28, 36))
+        for v in range(28):
+            for u in range(36):
+                x, y = self.fov.project(self.pinhole.unproject(np.array([u, v]), 1.0))
+                ref[v, u] = bilinear(self.images[1], x, y)
+        self.output = single
+        return (undistorted.shape == (3, 28, 36)
+                and np.allclose(undistorted[1], ref, atol=1e-4)
+                and np.allclose(single, ref, atol=1e-4))
+
+    def define_success_message(self):
+        return f"Congratulations: You passed the test case for the undistortion."
+
+    def define_failure_message(self):
+        return f"The output of the undistortion is incorrect (got {self.output})."
+
+
+class UndistortionCache(UnitTest):
+    def __init__(self) -> None:
+        self.output = None
+    def test(self):
+        pinhole = Pinhole(36, 28, 25, 25, 18, 14)
+        map_1 = get_undistortion_map(Fov(40, 30, 30, 30, 20, 15, 0.9), pinhole)
+        map_2 = get_undistortion_map(Fov(40, 30, 30, 30, 20, 15, 0.9), pinhole)
+        map_3 = get_undistortion_map(Fov(40, 30, 30, 30, 20, 15, 0.8), pinhole)
+        rgb = np.random.randint(0, 256, (30, 40, 3), dtype=np.uint8)
+        self.output = undistort(rgb, Fov(40, 30, 30, 30, 20, 15, 0.9), pinhole)
+        return map_1 is map_2 and map_1 is not map_3 and self.output.shape == (28, 36, 3) and self.output.dtype == np.uint8
+
+    def define_success_message(self):
+        return f"Congratulations: You passed the test case for the undistortion grid cache."
+
+    def define_failure_message(self):
+        return f"The undistortion grid cache is incorrect."
+
+
+class UndistortionBatchLayout(UnitTest):
+    def __init__(self) -> None:
+        self.fov = Fov(32, 32, 25, 25, 16, 16, 0.9)
+        self.pinhole = Pinhole(30, 30, 20, 20, 15, 15)
+        self.output = None
+    def test(self):
+        # a batch as large as the image height, on a square sensor the shape alone is ambiguous
+        images = np.random.rand(32, 32, 32).astype(np.float32)
+        batch = undistort(images, self.fov, self.pinhole, batched=True)
+        rgb = undistort(images, self.fov, self.pinhole, batched=False)
+        expected = np.stack([undistort(image, self.fov, self.pinhole) for image in images])
+        self.output = batch.shape
+        result = (batch.shape == (32, 30, 30) and np.array_equal(batch, expected)
+                  and rgb.shape == (30, 30, 32)
+                  and np.array_equal(rgb[..., 5], undistort(images[..., 5], self.fov, self.pinhole)))
+        for shape, batched in [((32, 32, 32), None), ((4, 31, 32), None), ((31, 32), False), ((32, 32), True)]:
+            try:
+                undistort(np.zeros(shape), self.fov, self.pinhole, batched=batched)
+                result = False
+            except ValueError:
+                pass
+        return result
+
+    def define_success_message(self):
+        return f"Congratulations: You passed the test case for the undistortion batch layout."
+
+    def define_failure_message(self):
+        return f"The undistortion batch layout is incorrect (got shape {self.output})."
+
+
+class UndistortionCacheBound(UnitTest):
+    def __init__(self) -> None:
+        self.output = None
+    def test(self):
+        pinhole = Pinhole(12, 10, 10, 10, 6, 5)
+        first = get_undistortion_map(Fov(12, 10, 10, 10, 6, 5, 0.1), pinhole)
+        for i in range(20):
+            get_undistortion_map(Fov(12, 10, 10, 10, 6, 5, 0.2 + 0.01 * i), pinhole)
+        info = _build_undistortion_map.cache_info()
+        self.output = info.currsize
+        return info.currsize <= info.maxsize and get_undistortion_map(Fov(12, 10, 10, 10, 6, 5, 0.1), pinhole) is not first
+
+    def define_success_message(self):
+        return f"Congratulations: You passed the test case for the bounded undistortion grid cache."
+
+    def define_failure_message(self):
+        return f"The undistortion grid cache is not bounded (holds {self.output} maps)."
+
+
+class UndistortionTest(CompositeTest):
+    def define_tests(self):
+        return [
+            Undistortion(),
+            UndistortionCache(),
+            UndistortionBatchLayout(),
+            UndistortionCacheBound()
+        ]
+
+def test_undistort():
+    test = UndistortionTest()
+    return test_results_to_score(test())
@@ -0,0 +1,75 @@
+import numpy as np
+from .base_tests import UnitTest, CompositeTest, test_results_to_score
+
+from exercise_code.camera import *
+from exercise_code.visibility import VisibilityIndex
+from scipy.spatial.transform import Rotation
+
+class VisibilityQuery(UnitTest):
+    def __init__(self, far=None) -> None:
+        self.far = far
+        self.points = np.random.uniform(-20, 20, (20000, 3))
+        self.pose = np.hstack((Rotation.from_rotvec(np.random.randn(3)).as_matrix(), np.random.uniform(-5, 5, (3, 1))))
+        self.output = None
+    def test(self):
+        cam = Pinhole(640, 480, 600, 600, 320, 240)
+        index = VisibilityIndex(self.points, cell_size=2.0)
+        idx, pix = index.query(cam, self.pose, far=self.far)
+
+        # reference: project everything and filter
+        relative_pose = compute_relative_pose(np.eye(3, 4), self.pose)
+        pts_cam = self.points @ relative_pose[:, :3].T + relative_pose[:, 3]
+        ref_pix = cam.project(pts_cam)
+        ref = (pts_cam[:, 2] > 1e-6) & (ref_pix[:, 0] >= 0) & (ref_pix[:, 0] < 640) & (ref_pix[:, 1] >= 0) & (ref_pix[:, 1] < 480)
+        if self.far is not None:
+            ref &= pts_cam[:, 2] <= self.far
+        self.output = (len(idx), ref.sum())
+        order = np.argsort(idx)
+        return np.array_equal(idx[order], np.flatnonzero(ref)) and np.allclose(pix[order], ref_pix[ref])
+
+    def define_success_message(self):
+        return f"Congratulations: You passed the test case for the visibility query (far = {self.far})."
+
+    def define_failure_message(self):
+        return f"The visibility query is incorrect (found {self.output[0]} points, expected {self.output[1]})."
+
+
+class VisibilityHiddenCost(UnitTest):
+    def __init__(self) -> None:
+        self.visible = np.random.uniform([-5, -5, 2], [5, 5, 10], (8000, 3))
+        self.hidden = np.random.uniform([-400, -400, -400], [400, 400, -1], (50000, 3))
+        self.output = None
+    def test(self):
+        # points behind the camera grow the map but not the visible set
+        cam = Pinhole(640, 480, 600, 600, 320, 240)
+        tested = []
+        results = []
+        for points in (self.visible, np.vstack((self.visible, self.hidden))):
+            index = VisibilityIndex(points, cell_size=1.0)
+            cull = index.cull
+            counts = []
+            index.cull = lambda level, blocks, normals, offsets: counts.append(len(blocks)) or cull(level, blocks, normals, offsets)
+            results.append(index.query(cam, np.eye(3, 4))[0])
+            tested.append((sum(counts), len(index.counts)))
+        self.output = tested
+        return (np.array_equal(np.sort(results[0]), np.sort(results[1]))
+                and tested[1][1] > 20 * tested[0][1] and tested[1][0] < 2 * tested[0][0])
+
+    def define_success_message(self):
+        return f"Congratulations: You passed the test case for the visibility query cost with hidden points."
+
+    def define_failure_message(self):
+        return f"The visibility query tests too many blocks (tested blocks and cells: {self.output})."
+
+
+class VisibilityTest(CompositeTest):
+    def define_tests(self):
+        return [
+            VisibilityQuery(),
+            VisibilityQuery(far=10.0),
+            VisibilityHiddenCost()
+        ]
+
+def test_visibility():
+    test = VisibilityTest()
+    return test_results_to_score(test())
@@ -1,5 +1,9 @@
+from .featureContext import FeatureContext, FrameFeatures
+from .flowTracker import FlowTracker
 from .getFlow import getFlow
 from .getHarrisCorners import getHarrisCorners
-from .utils import getM, getGradients, getTemporalPartialDerivative, getq, getGaussiankernel
+from .tiledFlow import compute_flow_tiled
+from .trackPoints import trackPoints
+from .utils import getM, getGradients, getTemporalPartialDerivative, getq, getGaussiankernel, getGaussiankernel1d, getStructureTensor, getEigenvalues
 from .visualize import drawPoints
 
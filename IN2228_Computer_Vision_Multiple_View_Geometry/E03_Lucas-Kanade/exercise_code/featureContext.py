@@ -0,0 +1,115 @@
+from collections import OrderedDict
+import numpy as np
+from exercise_code.utils import getSmoothedImage, getCentralDifferences, getWindowedProducts, getStructureTensor
+from exercise_code.getFlow import getFlow
+from exercise_code.getHarrisCorners import getHarrisCorners
+
+class FrameFeatures:
+    # Blurred image, gradients and structure tensors of one frame.
+    # Each is computed on first use and kept, so corner detection and flow share them.
+
+    def __init__(self, frame, sigma_blur=2):
+        # Input:
+        # frame: numpy.ndarray (grayscale frame) of shape (H, W)
+        # sigma_blur: float (standard deviation of the image blur)
+        self.frame = frame
+        self.sigma_blur = sigma_blur
+        self._blurred = None
+        self._gradients = None
+        self._structure_tensors = {}
+
+    @property
+    def blurred(self):
+        # numpy.ndarray (float32 image scaled to [0, 1] and blurred) of shape (H, W)
+        if self._blurred is None:
+            self._blurred = getSmoothedImage(self.frame, self.sigma_blur)
+        return self._blurred
+
+    @property
+    def gradients(self):
+        # tuple (Ix, Iy) of numpy.ndarray of shape (H, W)
+        if self._gradients is None:
+            self._gradients = getCentralDifferences(self.blurred)
+        return self._gradients
+
+    def structureTensor(self, sigma=7, window='gaussian'):
+        # Input:
+        # sigma: float (standard deviation of the window)
+        # window: str ('gaussian' or 'box')
+        # Output:
+        # M: numpy.ndarray (structure tensor) of shape (H, W, 2, 2)
+        key = (sigma, window)
+        if key not in self._structure_tensors:
+            Ix, Iy = self.gradients
+            self._structure_tensors[key] = getStructureTensor(Ix, Iy, None, sigma, window)[0]
+        return self._structure_tensors[key]
+
+
+class FeatureContext:
+    # Least recently used cache of FrameFeatures keyed by frame id and blur sigma,
+    # shared between the Harris detector and the Lucas-Kanade solver.
+
+    def __init__(self, max_frames=3, sigma_blur=2):
+        # Input:
+        # max_frames: int (number of frames kept, older frames are dropped first)
+        # sigma_blur: float (default standard deviation of the image blur)
+        self.max_frames = max_frames
+        self.sigma_blur = sigma_blur
+        self.frames = OrderedDict()
+
+    def features(self, frame_id, frame=None, sigma_blur=None):
+        # Input:
+        # frame_id: hashable (identifies the frame, e.g. its index in the sequence)
+        # frame: numpy.ndarray (grayscale frame) of shape (H, W), only needed the first time
+        # sigma_blur: float (standard deviation of the image blur), None uses the default
+        # Output:
+        # features: FrameFeatures of the frame
+        if sigma_blur is None:
+            sigma_blur = self.sigma_blur
+        key = (frame_id, sigma_blur)
+        if key in self.frames:
+            self.frames.move_to_end(key)
+            return self.frames[key]
+        if frame is None:
+            raise KeyError("frame {} is not cached, pass the image".format(frame_id))
+
+        features = FrameFeatures(frame, sigma_blur)
+        self.frames[key] = features
+        if len(self.frames) > self.max_frames:
+            self.frames.popitem(last=False)
+        return features
+
+    def corners(self, frame_id, kappa, theta, frame=None, sigma=7, window='gaussian', **kwargs):
+        # Input:
+        # frame_id, frame: as in features
+        # kappa, theta, **kwargs: as in getHarrisCorners
+        # sigma, window: window of the structure tensor
+        # Output:
+        # score: numpy.ndarray (corner score) of shape (H, W)
+        # points: numpy.ndarray (detected corners) of shape (N, 2)
+        M = self.features(frame_id, frame).structureTensor(sigma, window)
+        return getHarrisCorners(M, kappa, theta, **kwargs)
+
+    def flow(self, frame_id1, frame_id2, points=None, frame1=None, frame2=None, sigma=7, window='gaussian', min_eig=1e-3):
+        # Input:
+        # frame_id1, frame1: first frame, as in features
+        # frame_id2, frame2: second frame, as in features
+        # points: numpy.ndarray (points, row and column) of shape (N, 2), None for dense flow only
+        # sigma, window: window of the structure tensor
+        # min_eig: float (as in getFlow)
+        # Output:
+        # v: numpy.ndarray (flow) of shape (H, W, 2)
+        # v_points: numpy.ndarray (flow for the points) of shape (N, 2)
+        features1 = self.features(frame_id1, frame1)
+        features2 = self.features(frame_id2, frame2)
+
+        # M of the first frame is shared with corner detection, only q depends on both frames
+        M = features1.structureTensor(sigma, window)
+        Ix, Iy = features1.gradients
+        It = features2.blurred - features1.blurred
+        q1, q2 = getWindowedProducts(np.stack((Ix * It, Iy * It)), sigma, window)
+        q = np.stack((q1, q2), axis=-1)
+
+        if points is None:
+            points = np.zeros((0, 2), dtype=int)
+        return getFlow(M, q, points, min_eig)
@@ -0,0 +1,56 @@
+from exercise_code.utils import getSmoothedImage, getCentralDifferences, getStructureTensor
+from exercise_code.getFlow import solveFlow
+
+class FlowTracker:
+    # Lucas-Kanade flow over a sequence of frames.
+    # The blurred float32 image and the gradients of the previous frame are kept, so every
+    # new frame is blurred once and differentiated once, instead of up to three times
+    # when each pair is passed to compute_flow independently.
+
+    def __init__(self, sigma_blur=2, sigma=7, window='gaussian', min_eig=1e-3):
+        # Input:
+        # sigma_blur: float (standard deviation of the image blur)
+        # sigma: float (standard deviation of the Gaussian window)
+        # window: str ('gaussian' or 'box' window for the structure tensor)
+        # min_eig: float (as in getFlow)
+        self.sigma_blur = sigma_blur
+        self.sigma = sigma
+        self.window = window
+        self.min_eig = min_eig
+        self.reset()
+
+    def reset(self):
+        # forget the previous frame, the next frame starts a new sequence
+        self.prev_blurred = None
+        self.prev_Ix = None
+        self.prev_Iy = None
+
+    def update(self, frame):
+        # Input:
+        # frame: numpy.ndarray (next grayscale frame) of shape (H, W)
+        # Output:
+        # flow: numpy.ndarray (flow from the previous frame to this frame) of shape (H, W, 2),
+        #       None for the first frame of a sequence
+
+        blurred = getSmoothedImage(frame, self.sigma_blur)
+        Ix, Iy = getCentralDifferences(blurred)
+
+        flow = None
+        if self.prev_blurred is not None:
+            It = blurred - self.prev_blurred
+            M, q = getStructureTensor(self.prev_Ix, self.prev_Iy, It, self.sigma, self.window)
+            flow, _ = solveFlow(M, q, self.min_eig)
+
+        self.prev_blurred, self.prev_Ix, self.prev_Iy = blurred, Ix, Iy
+        return flow
+
+    def track(self, frames):
+        # Input:
+        # frames: iterable of numpy.ndarray (grayscale frames) of shape (H, W)
+        # Output:
+        # generator of numpy.ndarray (flow between consecutive frames) of shape (H, W, 2)
+
+        for frame in frames:
+            flow = self.update(frame)
+            if flow is not None:
+                yield flow
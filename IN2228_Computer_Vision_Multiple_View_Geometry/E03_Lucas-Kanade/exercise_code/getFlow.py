@@ -1,15 +1,45 @@
 import numpy as np
-from exercise_code.utils import getM, getGradients, getTemporalPartialDerivative, getq
+from exercise_code.utils import getGradients, getTemporalPartialDerivative, getq, getStructureTensor, getEigenvalues, getPyramid, warpImage
+import cv2
 
-def getFlow(M, q, points):
+def solveFlow(M, q, min_eig=1e-3):
+    # Solve the Lucas-Kanade systems M v = -q in closed form
+    # Input:
+    # M: numpy.ndarray (structure tensors) of shape (..., 2, 2)
+    # q: numpy.ndarray (q vectors) of shape (..., 2)
+    # min_eig: float (systems whose smaller eigenvalue of M is below min_eig times the larger one get zero flow)
+    # Output:
+    # v: numpy.ndarray (flow) of shape (..., 2)
+    # valid: numpy.ndarray (bool, well-conditioned systems) of shape (...)
+
+    # Cramer's rule for all systems at once
+    a, b, d = M[..., 0, 0], M[..., 0, 1], M[..., 1, 1]
+    q1, q2 = q[..., 0], q[..., 1]
+    det = a * d - b * b
+
+    # ill-conditioned windows (flat regions, edges) have a small eigenvalue and get zero flow,
+    # relative to the larger one so the threshold stays above the float32 round-off of M
+    lambda_min, lambda_max = getEigenvalues(M)
+    valid = (lambda_min >= min_eig * lambda_max) & (lambda_max > 0)
+
+    v = np.zeros(q.shape, dtype=np.result_type(M, q))
+    np.divide(b * q2 - d * q1, det, out=v[..., 0], where=valid)
+    np.divide(b * q1 - a * q2, det, out=v[..., 1], where=valid)
+    return v, valid
+
+
+def getFlow(M, q, points, min_eig=1e-3, return_mask=False):
     # Calculate the flow between two images
     # Input:
     # M: numpy.ndarray (structure tensor) of shape (H, W, 2, 2)
     # q: numpy.ndarray (q vector) of shape (H, W, 2)
     # points: numpy.ndarray (points) of shape (N, 2)
+    # min_eig: float (pixels whose smaller eigenvalue of M is below min_eig times the larger one get zero flow)
+    # return_mask: bool (also return the validity mask)
     # Output:
     # v: numpy.ndarray (flow) of shape (H, W, 2)
     # v_points: numpy.ndarray (flow for the points) of shape (N, 2)
+    # valid: numpy.ndarray (bool, well-conditioned pixels) of shape (H, W), only if return_mask is True
 
     ########################################################################
     # TODO:                                                                #
@@ -17,28 +47,32 @@ def getFlow(M, q, points):
     #                                                                      #
     ########################################################################
 
-
-    pass
+    v, valid = solveFlow(M, q, min_eig)
+    v_points = v[points[:, 0], points[:, 1]]
 
     ########################################################################
     #                           END OF YOUR CODE                           #
     ########################################################################
 
+    if return_mask:
+        return v, v_points, valid
     return v, v_points
 
 
-def compute_flow(im1_gray, im2_gray):
+def compute_flow(im1_gray, im2_gray, window='gaussian', levels=1, iterations=1):
     # Compute the optical flow using the Lucas-Kanade method.
     # Input:
     # im1_gray: numpy.ndarray (first image) of shape (H, W)
     # im2_gray: numpy.ndarray (second image) of shape (H, W)
+    # window: str ('gaussian' or 'box' window for the structure tensor)
+    # levels: int (number of pyramid levels, 1 estimates the flow at full resolution only)
+    # iterations: int (number of warp-and-refine steps per level)
     # Output:
     # flow_lk: numpy.ndarray (flow) of shape (H, W, 2)
 
     use_cv2=False
     # The following code is used to compute the optical flow using the Lucas-Kanade method which is implemented in the getFlow function.
     if use_cv2:
-        import cv2
         # get dense points for flow
         x = np.arange(0, im1_gray.shape[0], 1)
         y = np.arange(0, im1_gray.shape[1], 1)
@@ -62,14 +96,30 @@ def compute_flow(im1_gray, im2_gray):
             except:
                 pass
     else:
-        x = np.arange(0, im1_gray.shape[0], 1)
-        y = np.arange(0, im1_gray.shape[1], 1)
-        x, y = np.meshgrid(x, y)
-        points = np.array([x.flatten(), y.flatten()]).T
-        It = getTemporalPartialDerivative(im1_gray, im2_gray)
-        Ix, Iy = getGradients(im1_gray)
-        q = getq(It, Ix, Iy)
-        M = getM(Ix, Iy)# get dense points for flow
-        flow_lk, flow_lk_points = getFlow(M, q, points)
-        
+        # the dense flow is returned as an image, no per-point flow is needed
+        points = np.zeros((0, 2), dtype=int)
+
+        # coarse-to-fine: estimate at the coarsest level, then upsample, warp and refine
+        pyramid1 = getPyramid(im1_gray, levels)
+        pyramid2 = getPyramid(im2_gray, levels)
+        flow_lk = None
+        for I1, I2 in zip(reversed(pyramid1), reversed(pyramid2)):
+            if flow_lk is None:
+                flow_lk = np.zeros(I1.shape + (2,), dtype=np.float32)
+            else:
+                flow_lk = 2 * cv2.resize(flow_lk, (I1.shape[1], I1.shape[0]), interpolation=cv2.INTER_LINEAR)
+
+            # M depends only on the first image and stays fixed while refining on this level
+            Ix, Iy = getGradients(I1)
+            for it in range(iterations):
+                I2_warped = warpImage(I2, flow_lk) if np.any(flow_lk) else I2
+                It = getTemporalPartialDerivative(I1, I2_warped)
+                if it == 0:
+                    # M and q share the same window, weight all five products in one pass
+                    M, q = getStructureTensor(Ix, Iy, It, window=window)
+                else:
+                    q = getq(It, Ix, Iy, window=window)
+                dflow, _ = getFlow(M, q, points)
+                flow_lk = flow_lk + dflow
+
     return flow_lk
\ No newline at end of file
@@ -1,11 +1,88 @@
 import numpy as np
+import cv2
+from exercise_code.utils import getEigenvalues
 
-def getHarrisCorners(M, kappa, theta):
+def getCornerScore(M, kappa, method='harris'):
+    # Compute the corner score of every pixel in closed form
+    # Input:
+    # M: structure tensor of shape (H, W, 2, 2)
+    # kappa: float (parameter for Harris corner score, unused for Shi-Tomasi)
+    # method: str ('harris' for det(M) - kappa trace^2(M), 'shi-tomasi' for the smaller eigenvalue of M)
+    # Output:
+    # score: numpy.ndarray (corner score) of shape (H, W)
+
+    if method == 'harris':
+        det = M[..., 0, 0] * M[..., 1, 1] - M[..., 0, 1] * M[..., 1, 0]
+        trace = M[..., 0, 0] + M[..., 1, 1]
+        return det - kappa * trace ** 2
+    if method == 'shi-tomasi':
+        lambda_min, _ = getEigenvalues(M)
+        return lambda_min
+    raise ValueError("method must be 'harris' or 'shi-tomasi', got {}".format(method))
+
+def getLocalMaxima(score, theta, nms_radius=None):
+    # Threshold the score and keep only local maxima
+    # Input:
+    # score: numpy.ndarray (corner score) of shape (H, W)
+    # theta: float (threshold for corner detection)
+    # nms_radius: int (pixels must beat every pixel within this radius), None compares with the four adjacent pixels
+    # Output:
+    # mask: numpy.ndarray (bool, detected corners) of shape (H, W)
+
+    if nms_radius is None:
+        footprint = np.array([[0, 1, 0], [1, 0, 1], [0, 1, 0]], dtype=np.uint8)
+    else:
+        footprint = np.ones((2 * nms_radius + 1, 2 * nms_radius + 1), dtype=np.uint8)
+        footprint[nms_radius, nms_radius] = 0
+
+    # sliding max (dilation) over the neighbours only, pixels outside the image never suppress a corner
+    score = np.ascontiguousarray(score, dtype=np.result_type(score, np.float32))
+    neighbours = cv2.dilate(score, footprint, borderType=cv2.BORDER_CONSTANT, borderValue=-np.inf)
+    return (score > theta) & (score > neighbours)
+
+def selectCorners(points, values, max_corners=None, grid=None, per_cell=None, shape=None):
+    # Keep the strongest corners, optionally with a budget per cell of a regular grid
+    # Input:
+    # points: numpy.ndarray (corners, row and column) of shape (N, 2)
+    # values: numpy.ndarray (scores of the corners) of shape (N,)
+    # max_corners: int (maximum number of corners in total), None keeps all
+    # grid: tuple (number of cell rows, number of cell columns), None disables bucketing
+    # per_cell: int (maximum number of corners per grid cell)
+    # shape: tuple (H, W) of the image, needed for the grid
+    # Output:
+    # points: numpy.ndarray (selected corners, strongest first) of shape (K, 2)
+
+    if grid is not None and per_cell is not None:
+        H, W = shape
+        cell = (points[:, 0] * grid[0] // H) * grid[1] + points[:, 1] * grid[1] // W
+
+        # sort by cell and by descending score inside the cell, then keep the first per_cell of each cell
+        order = np.lexsort((-values, cell))
+        cell_sorted = cell[order]
+        starts = np.flatnonzero(np.r_[True, cell_sorted[1:] != cell_sorted[:-1]])
+        rank = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+        keep = order[rank < per_cell]
+        points, values = points[keep], values[keep]
+
+    # the K strongest corners in linear time, only those K are sorted
+    if max_corners is not None and len(values) > max_corners:
+        strongest = np.argpartition(-values, max_corners - 1)[:max_corners]
+        points, values = points[strongest], values[strongest]
+
+    order = np.argsort(-values, kind='stable')
+    return points[order]
+
+def getHarrisCorners(M, kappa, theta, method='harris', nms_radius=None, max_corners=None, grid=None, per_cell=None):
     # Compute Harris corners
     # Input:
     # M: structure tensor of shape (H, W, 2, 2)
     # kappa: float (parameter for Harris corner score) 
     # theta: float (threshold for corner detection)
+    # method: str ('harris' or 'shi-tomasi' score)
+    # nms_radius: int (radius of the non-maximum suppression), None compares with the four adjacent pixels
+    # max_corners: int (keep only the strongest corners, sorted by score), None keeps all
+    # grid: tuple (cell rows, cell columns) to spread the corners over the image
+    # per_cell: int (maximum number of corners per grid cell)
     # Output:
     # score: numpy.ndarray (Harris corner score) of shape (H, W)
     # points: numpy.ndarray (detected corners) of shape (N, 2)
@@ -21,12 +98,14 @@ def getHarrisCorners(M, kappa, theta):
     # - Use non-maximum suppression to find the corners.                   #
     ########################################################################
 
+    score = getCornerScore(M, kappa, method)
+    points = np.argwhere(getLocalMaxima(score, theta, nms_radius))
 
-    pass
+    if max_corners is not None or (grid is not None and per_cell is not None):
+        points = selectCorners(points, score[points[:, 0], points[:, 1]], max_corners, grid, per_cell, score.shape)
 
     ########################################################################
     #                           END OF YOUR CODE                           #
     ########################################################################
 
     return score, points
-
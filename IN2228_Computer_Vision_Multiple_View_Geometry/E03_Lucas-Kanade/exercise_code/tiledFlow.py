@@ -0,0 +1,120 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from exercise_code.utils import getGradients, getTemporalPartialDerivative, getStructureTensor, getGaussiankernel1d
+from exercise_code.getFlow import solveFlow
+
+# shared arrays attached by each worker process, keyed by name
+_worker_arrays = {}
+
+# OpenCV filters rows in SIMD chunks and finishes the last columns separately, the rounding only
+# matches the untiled image if the crops start on the same column alignment
+COLUMN_ALIGNMENT = 16
+
+def getHalo(sigma_blur=2, sigma=7, window='gaussian'):
+    # number of pixels around a tile that influence the flow inside it
+    # Input:
+    # sigma_blur: float (standard deviation of the image blur)
+    # sigma: float (standard deviation of the structure tensor window)
+    # window: str ('gaussian' or 'box')
+    # Output:
+    # halo: int (blur radius + one pixel for the central differences + window radius)
+
+    blur_radius = int(np.ceil(4 * sigma_blur + 1)) // 2 if sigma_blur > 0 else 0
+    if window == 'box':
+        window_radius = int(2 * sigma)
+    else:
+        window_radius = len(getGaussiankernel1d(sigma)) // 2
+    return blur_radius + 1 + window_radius
+
+def computeTileFlow(im1_gray, im2_gray, flow, tile, halo, sigma_blur=2, sigma=7, window='gaussian', min_eig=1e-3):
+    # compute the flow of one tile from the tile plus its halo and write it into the output
+    # Input:
+    # im1_gray: numpy.ndarray (first image) of shape (H, W)
+    # im2_gray: numpy.ndarray (second image) of shape (H, W)
+    # flow: numpy.ndarray (output flow, written in place) of shape (H, W, 2)
+    # tile: tuple (first row, last row + 1, first column, last column + 1)
+    # halo: int (pixels added around the tile, see getHalo)
+
+    r0, r1, c0, c1 = tile
+    H, W = im1_gray.shape
+
+    # at the image border the crop ends where the image ends, so the filters see the same border as untiled
+    a0, a1 = max(r0 - halo, 0), min(r1 + halo, H)
+    b0 = max(c0 - halo, 0) // COLUMN_ALIGNMENT * COLUMN_ALIGNMENT
+    b1 = min(-(-(c1 + halo) // COLUMN_ALIGNMENT) * COLUMN_ALIGNMENT, W)
+    I1 = im1_gray[a0:a1, b0:b1]
+    I2 = im2_gray[a0:a1, b0:b1]
+
+    It = getTemporalPartialDerivative(I1, I2, sigma_blur)
+    Ix, Iy = getGradients(I1, sigma_blur)
+    M, q = getStructureTensor(Ix, Iy, It, sigma, window)
+    v, _ = solveFlow(M, q, min_eig)
+
+    flow[r0:r1, c0:c1] = v[r0 - a0:r1 - a0, c0 - b0:c1 - b0]
+
+def _attach_shared(specs):
+    # worker initializer: map the shared inputs and output into this process
+    for key, (name, shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=name)
+        _worker_arrays[key] = (shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+
+def _compute_shared_tile(tile, halo, sigma_blur, sigma, window, min_eig):
+    arrays = {key: array for key, (_, array) in _worker_arrays.items()}
+    computeTileFlow(arrays['im1'], arrays['im2'], arrays['flow'], tile, halo, sigma_blur, sigma, window, min_eig)
+
+def compute_flow_tiled(im1_gray, im2_gray, tile_size=256, workers=None, sigma_blur=2, sigma=7, window='gaussian', min_eig=1e-3):
+    # Compute the dense Lucas-Kanade flow tile by tile in a process pool.
+    # Each worker only holds the structure tensor of one tile plus its halo. With the Gaussian window
+    # the result is identical to the untiled compute_flow, the summed-area tables of the box window
+    # round differently per tile and agree to float32 precision.
+    # Input:
+    # im1_gray: numpy.ndarray (first image) of shape (H, W)
+    # im2_gray: numpy.ndarray (second image) of shape (H, W)
+    # tile_size: int (edge length of the tiles, without the halo)
+    # workers: int (number of processes, None uses all cores, 1 runs in this process)
+    # sigma_blur, sigma, window, min_eig: as in getGradients, getStructureTensor and getFlow
+    # Output:
+    # flow: numpy.ndarray (flow) of shape (H, W, 2)
+
+    H, W = im1_gray.shape
+    halo = getHalo(sigma_blur, sigma, window)
+    tiles = [(r, min(r + tile_size, H), c, min(c + tile_size, W))
+             for r in range(0, H, tile_size) for c in range(0, W, tile_size)]
+    if workers is None:
+        workers = os.cpu_count()
+    workers = min(workers, len(tiles))
+
+    if workers <= 1:
+        flow = np.zeros((H, W, 2), dtype=np.float32)
+        for tile in tiles:
+            computeTileFlow(im1_gray, im2_gray, flow, tile, halo, sigma_blur, sigma, window, min_eig)
+        return flow
+
+    # inputs and output live in shared memory, the workers only receive tile coordinates
+    arrays = {
+        'im1': np.ascontiguousarray(im1_gray),
+        'im2': np.ascontiguousarray(im2_gray),
+        'flow': np.zeros((H, W, 2), dtype=np.float32),
+    }
+    shms = {}
+    try:
+        specs = {}
+        for key, array in arrays.items():
+            shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            shms[key] = shm
+            np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+            specs[key] = (shm.name, array.shape, array.dtype)
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_shared, initargs=(specs,)) as pool:
+            futures = [pool.submit(_compute_shared_tile, tile, halo, sigma_blur, sigma, window, min_eig) for tile in tiles]
+            for future in futures:
+                future.result()
+
+        flow = np.ndarray((H, W, 2), dtype=np.float32, buffer=shms['flow'].buf).copy()
+    finally:
+        for shm in shms.values():
+            shm.close()
+            shm.unlink()
+    return flow
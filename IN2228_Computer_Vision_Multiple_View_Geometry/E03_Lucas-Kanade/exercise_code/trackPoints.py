@@ -0,0 +1,118 @@
+import numpy as np
+import cv2
+from exercise_code.utils import getGaussiankernel1d
+from exercise_code.getFlow import solveFlow
+
+def reflect101(idx, n):
+    # map indices into [0, n-1] like cv2.BORDER_REFLECT_101 (... 2 1 | 0 1 2 ... n-1 | n-2 ...)
+    if n == 1:
+        return np.zeros_like(idx)
+    period = 2 * (n - 1)
+    idx = np.mod(idx, period)
+    return np.where(idx > n - 1, period - idx, idx)
+
+def reflectSymmetric(idx, n):
+    # map indices into [0, n-1] like cv2.BORDER_REFLECT (... 1 0 | 0 1 2 ... n-1 | n-1 ...)
+    idx = np.mod(idx, 2 * n)
+    return np.where(idx > n - 1, 2 * n - 1 - idx, idx)
+
+def getSmoothedPatches(I, points, radius, g):
+    # blur the patches of radius `radius` around the points, pixels outside the image are reflected like cv2.BORDER_DEFAULT
+    # Input:
+    # I: numpy.ndarray (image) of shape (H, W)
+    # points: numpy.ndarray (points, row and column) of shape (N, 2)
+    # radius: int (radius of the blurred patches)
+    # g: numpy.ndarray (1D blur kernel) of shape (2*r+1,)
+    # Output:
+    # patches: numpy.ndarray (float32 blurred patches, scaled to [0, 1]) of shape (N, 2*radius+1, 2*radius+1)
+
+    R = radius + len(g) // 2
+    offsets = np.arange(-R, R + 1)
+    rows = reflect101(points[:, 0:1] + offsets, I.shape[0])
+    cols = reflect101(points[:, 1:2] + offsets, I.shape[1])
+    patches = I[rows[:, :, None], cols[:, None, :]].astype(np.float32) / 255.0
+    r = len(g) // 2
+    if len(points) == 0:
+        # cv2 does not filter empty images
+        return patches[:, r:2 * R + 1 - r, r:2 * R + 1 - r]
+
+    # blur all patches in one call on the patches stacked on top of each other, the taps of a
+    # pixel only cross into a neighbouring patch outside the valid part that is kept
+    n, L = patches.shape[0], 2 * R + 1
+    blurred = cv2.sepFilter2D(patches.reshape(n * L, L), -1, g, g, borderType=cv2.BORDER_REFLECT_101)
+    return blurred.reshape(n, L, L)[:, r:L - r, r:L - r]
+
+def trackPoints(im1_gray, im2_gray, points, sigma_blur=2, sigma=7, min_eig=1e-3, return_mask=False):
+    # Compute the Lucas-Kanade flow at a sparse set of points only
+    # Input:
+    # im1_gray: numpy.ndarray (first image) of shape (H, W)
+    # im2_gray: numpy.ndarray (second image) of shape (H, W)
+    # points: numpy.ndarray (points, row and column) of shape (N, 2)
+    # sigma_blur: float (standard deviation of the image blur, as in getGradients)
+    # sigma: float (standard deviation of the Gaussian window, as in getM)
+    # min_eig: float (points whose smaller eigenvalue of M is below min_eig times the larger one get zero flow)
+    # return_mask: bool (also return the validity mask)
+    # Output:
+    # v_points: numpy.ndarray (flow for the points) of shape (N, 2)
+    # valid: numpy.ndarray (bool, well-conditioned points) of shape (N,), only if return_mask is True
+
+    points = np.asarray(points, dtype=int).reshape(-1, 2)
+    H, W = im1_gray.shape
+    N = points.shape[0]
+    if N == 0:
+        # e.g. no corners were found in a textureless frame
+        v_points, valid = np.zeros((0, 2), dtype=np.float32), np.zeros(0, dtype=bool)
+        return (v_points, valid) if return_mask else v_points
+
+    # the window needs gradients within r of the point, the gradients need one more blurred pixel
+    g = getGaussiankernel1d(sigma)
+    r = len(g) // 2
+    if sigma_blur > 0:
+        k = int(np.ceil(4 * sigma_blur + 1))
+        g_blur = cv2.getGaussianKernel(k, sigma_blur).ravel()
+    else:
+        g_blur = np.ones(1, dtype=np.float32)
+
+    B1 = getSmoothedPatches(im1_gray, points, r + 1, g_blur)
+    B2 = getSmoothedPatches(im2_gray, points, r + 1, g_blur)
+
+    # outside the image the dense gradients replicate the border, so points close to it read
+    # those blurred values from the clamped position
+    border = np.flatnonzero(np.any((points <= r) | (points >= [H - 1 - r, W - 1 - r]), axis=1))
+    if border.size > 0:
+        offsets = np.arange(-(r + 1), r + 2)
+        p = points[border]
+        rows = np.clip(p[:, 0:1] + offsets, 0, H - 1) - p[:, 0:1] + r + 1
+        cols = np.clip(p[:, 1:2] + offsets, 0, W - 1) - p[:, 1:2] + r + 1
+        B1[border] = B1[border[:, None, None], rows[:, :, None], cols[:, None, :]]
+        B2[border] = B2[border[:, None, None], rows[:, :, None], cols[:, None, :]]
+
+    # central differences and temporal difference on the (2r+1, 2r+1) window
+    Ix = (B1[:, 1:-1, 2:] - B1[:, 1:-1, :-2]) / 2.0
+    Iy = (B1[:, 2:, 1:-1] - B1[:, :-2, 1:-1]) / 2.0
+    It = B2[:, 1:-1, 1:-1] - B1[:, 1:-1, 1:-1]
+
+    # the window reflects symmetrically at the image border, fold the weights of reflected taps onto their pixel
+    offsets = np.arange(-r, r + 1)
+    w_rows = np.zeros((N, 2 * r + 1))
+    w_cols = np.zeros((N, 2 * r + 1))
+    n_idx = np.arange(N)[:, None]
+    np.add.at(w_rows, (n_idx, reflectSymmetric(points[:, 0:1] + offsets, H) - points[:, 0:1] + r), g)
+    np.add.at(w_cols, (n_idx, reflectSymmetric(points[:, 1:2] + offsets, W) - points[:, 1:2] + r), g)
+    weights = (w_rows[:, :, None] * w_cols[:, None, :]).astype(np.float32)
+
+    # weighted sums of the gradient products, without materializing the products
+    wIx, wIy = weights * Ix, weights * Iy
+    M11 = np.einsum('nkl,nkl->n', wIx, Ix)
+    M12 = np.einsum('nkl,nkl->n', wIx, Iy)
+    M22 = np.einsum('nkl,nkl->n', wIy, Iy)
+    q1 = np.einsum('nkl,nkl->n', wIx, It)
+    q2 = np.einsum('nkl,nkl->n', wIy, It)
+
+    M = np.stack((M11, M12, M12, M22), axis=-1).reshape(N, 2, 2)
+    q = np.stack((q1, q2), axis=-1)
+    v_points, valid = solveFlow(M, q, min_eig)
+
+    if return_mask:
+        return v_points, valid
+    return v_points
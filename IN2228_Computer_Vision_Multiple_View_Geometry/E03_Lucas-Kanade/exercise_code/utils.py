@@ -1,8 +1,22 @@
 
-from scipy.signal import convolve2d as conv2
+from functools import lru_cache
 import numpy as np
 import cv2
 
+@lru_cache(maxsize=None)
+def getGaussiankernel1d(sigma):
+    # compute the 1D Gaussian kernel, memoized per sigma
+    # Input:
+    # sigma: float (standard deviation of Gaussian)
+    # Output:
+    # g: numpy.ndarray (read-only Gaussian kernel) of shape (4*sigma+1,)
+
+    x = np.arange(-2*sigma, 2*sigma + 1)
+    g = np.exp(-x**2 / (2 * sigma**2))
+    g = g / np.sum(g)
+    g.setflags(write=False)
+    return g
+
 def getGaussiankernel(sigma):
     # compute the 2D Gaussian kernel
     # Input:
@@ -21,8 +35,9 @@ def getGaussiankernel(sigma):
     # - The Gaussian kernel is separable.                                  #
     ########################################################################
 
-
-    pass
+    # the 2D kernel is the outer product of the 1D kernel with itself
+    g = getGaussiankernel1d(sigma)
+    G = np.outer(g, g)
 
     ########################################################################
     #                           END OF YOUR CODE                           #
@@ -30,6 +45,20 @@ def getGaussiankernel(sigma):
 
     return G
 
+def getSmoothedImage(I, sigma=2):
+    # scale an image to [0, 1] and blur it, shared by getGradients, getTemporalPartialDerivative and the trackers
+    # Input:
+    # I: numpy.ndarray (image) of shape (H, W)
+    # sigma: float (standard deviation of Gaussian)
+    # Output:
+    # I_: numpy.ndarray (float32 blurred image) of shape (H, W)
+
+    I_ = np.asarray(I, dtype=np.float32) / np.float32(255.0)
+    if sigma > 0:
+        k = int(np.ceil(4 * sigma + 1))
+        I_ = cv2.GaussianBlur(I_, (k, k), sigmaX=sigma, sigmaY=sigma, borderType=cv2.BORDER_DEFAULT)
+    return I_
+
 def getGradients(I, sigma=2):
     # compute spatial gradient
     # Input:
@@ -39,20 +68,14 @@ def getGradients(I, sigma=2):
     # Ix: numpy.ndarray (image gradient) of shape (H, W)
     # Iy: numpy.ndarray (image gradient) of shape (H, W)
 
-
-    I_ = I.copy()
-    I_ = I_/255.0
-    if sigma > 0:
-        k = int(np.ceil(4 * sigma + 1))
-        I_ = cv2.GaussianBlur(I_, (k, k), sigmaX=sigma, sigmaY=sigma, borderType=cv2.BORDER_DEFAULT)
+    I_ = getSmoothedImage(I, sigma)
 
     ########################################################################
     # TODO:                                                                #
     # Compute the spatial gradient using central differences.              #
     ########################################################################
 
-
-    pass
+    Ix, Iy = getCentralDifferences(I_)
 
     ########################################################################
     #                           END OF YOUR CODE                           #
@@ -60,6 +83,20 @@ def getGradients(I, sigma=2):
 
     return Ix, Iy
 
+def getCentralDifferences(I_):
+    # central differences of an already scaled and blurred image
+    # Input:
+    # I_: numpy.ndarray (image) of shape (H, W)
+    # Output:
+    # Ix: numpy.ndarray (image gradient) of shape (H, W)
+    # Iy: numpy.ndarray (image gradient) of shape (H, W)
+
+    # replicate the border so the differences at the border are one-sided halves
+    I_pad = np.pad(I_, 1, mode='edge')
+    Ix = (I_pad[1:-1, 2:] - I_pad[1:-1, :-2]) / 2.0
+    Iy = (I_pad[2:, 1:-1] - I_pad[:-2, 1:-1]) / 2.0
+    return Ix, Iy
+
 def getTemporalPartialDerivative(I1, I2, sigma=2):
     # compute temporal gradient
     # Input:
@@ -69,23 +106,16 @@ def getTemporalPartialDerivative(I1, I2, sigma=2):
     # Output:
     # It: numpy.ndarray (temporal gradient) of shape (H, W)
 
-    I1_ = I1.copy()
-    I2_ = I2.copy()
-    I1_ = I1_/255.0
-    I2_ = I2_/255.0
-    if sigma > 0:
-        k = int(np.ceil(4 * sigma + 1))
-        # blur images with Gaussian kernel
-        I1_ = cv2.GaussianBlur(I1_, (k, k), 0, 0, cv2.BORDER_DEFAULT)
-        I2_ = cv2.GaussianBlur(I2_, (k, k), 0, 0, cv2.BORDER_DEFAULT)
+    # blur images with Gaussian kernel
+    I1_ = getSmoothedImage(I1, sigma)
+    I2_ = getSmoothedImage(I2, sigma)
 
     ########################################################################
     # TODO:                                                                #
     # Compute the temporal gradient with forward differences               #
     ########################################################################
 
-
-    pass
+    It = I2_ - I1_
 
     ########################################################################
     #                           END OF YOUR CODE                           #
@@ -93,12 +123,13 @@ def getTemporalPartialDerivative(I1, I2, sigma=2):
 
     return It
 
-def getM(Ix, Iy, sigma=7):
+def getM(Ix, Iy, sigma=7, window='gaussian'):
     # compute structure tensor
     # Input:
     # Ix: numpy.ndarray (image gradient) of shape (H, W)
     # Iy: numpy.ndarray (image gradient) of shape (H, W)
     # sigma: float (standard deviation of Gaussian) 
+    # window: str ('gaussian' or 'box')
     # Output:
     # M: numpy.ndarray (structure tensor) of shape (H, W, 2, 2)
 
@@ -117,8 +148,7 @@ def getM(Ix, Iy, sigma=7):
     # M22: numpy.ndarray (element of structure tensor)                     #
     ########################################################################
 
-
-    pass
+    M11, M12, M22 = getWindowedProducts(np.stack((Ix * Ix, Ix * Iy, Iy * Iy)), sigma, window)
 
     ########################################################################
     #                           END OF YOUR CODE                           #
@@ -135,13 +165,14 @@ def getM(Ix, Iy, sigma=7):
 
     return M
 
-def getq(It, Ix, Iy, sigma=7):
+def getq(It, Ix, Iy, sigma=7, window='gaussian'):
     # compute q vector
     # Input:
     # It: numpy.ndarray (temporal gradient) of shape (H, W)
     # Ix: numpy.ndarray (image gradient) of shape (H, W)
     # Iy: numpy.ndarray (image gradient) of shape (H, W)
     # sigma: float (standard deviation of Gaussian)
+    # window: str ('gaussian' or 'box')
     # Output:
     # q: numpy.ndarray (q vector) of shape (H, W, 2)
 
@@ -159,8 +190,7 @@ def getq(It, Ix, Iy, sigma=7):
     # q2: numpy.ndarray (element of tensor q)                              #
     ########################################################################
 
-
-    pass
+    q1, q2 = getWindowedProducts(np.stack((Ix * It, Iy * It)), sigma, window)
 
     ########################################################################
     #                           END OF YOUR CODE                           #
@@ -171,4 +201,114 @@ def getq(It, Ix, Iy, sigma=7):
     assert(np.allclose(q[:,:,0], q1))
     assert(np.allclose(q[:,:,1], q2))
 
-    return q
\ No newline at end of file
+    return q
+
+def getWindowedProducts(products, sigma=7, window='gaussian'):
+    # weight stacked gradient products with the Gaussian or box window
+    # Input:
+    # products: numpy.ndarray (gradient products) of shape (C, H, W)
+    # sigma: float (standard deviation of Gaussian)
+    # window: str ('gaussian' or 'box', the box costs the same for any sigma)
+    # Output:
+    # windowed: numpy.ndarray (float32 weighted sums) of shape (C, H, W)
+
+    if window == 'box':
+        return getBoxWindowedProducts(products, sigma)
+    if window != 'gaussian':
+        raise ValueError("window must be 'gaussian' or 'box', got {}".format(window))
+
+    # the separable kernel turns the (4*sigma+1)^2 window into one row and one column pass,
+    # the symmetric border matches conv2(..., 'same', boundary='symm')
+    g = getGaussiankernel1d(sigma)
+    windowed = np.ascontiguousarray(products, dtype=np.float32)
+    for c in range(windowed.shape[0]):
+        cv2.sepFilter2D(windowed[c], -1, g, g, dst=windowed[c], borderType=cv2.BORDER_REFLECT)
+    return windowed
+
+def getBoxWindowedProducts(products, sigma=7):
+    # average stacked gradient products over a box window using summed-area tables
+    # Input:
+    # products: numpy.ndarray (gradient products) of shape (C, H, W)
+    # sigma: float (the box covers the same (4*sigma+1)^2 support as the Gaussian window)
+    # Output:
+    # windowed: numpy.ndarray (float32 box averages) of shape (C, H, W)
+
+    # pad with the same symmetric border as the Gaussian window
+    r = int(2 * sigma)
+    k = 2 * r + 1
+    C, H, W = products.shape
+    padded = np.pad(np.asarray(products, dtype=np.float64), ((0, 0), (r, r), (r, r)), mode='symmetric')
+
+    # summed-area table with a leading row and column of zeros, every box sum then costs four lookups
+    S = np.zeros((C, H + k, W + k))
+    np.cumsum(padded, axis=1, out=S[:, 1:, 1:])
+    np.cumsum(S[:, 1:, 1:], axis=2, out=S[:, 1:, 1:])
+
+    windowed = S[:, k:, k:] - S[:, :-k, k:] - S[:, k:, :-k] + S[:, :-k, :-k]
+    return (windowed / (k * k)).astype(np.float32)
+
+def getStructureTensor(Ix, Iy, It=None, sigma=7, window='gaussian'):
+    # compute the structure tensor M and the q vector in one fused pass
+    # Input:
+    # Ix: numpy.ndarray (image gradient) of shape (H, W)
+    # Iy: numpy.ndarray (image gradient) of shape (H, W)
+    # It: numpy.ndarray (temporal gradient) of shape (H, W), optional
+    # sigma: float (standard deviation of Gaussian)
+    # window: str ('gaussian' or 'box', the box costs the same for any sigma)
+    # Output:
+    # M: numpy.ndarray (structure tensor) of shape (H, W, 2, 2)
+    # q: numpy.ndarray (q vector) of shape (H, W, 2), None if It is not given
+
+    # stack the five products into a single (5, H, W) float32 array and weight them together
+    products = [Ix * Ix, Ix * Iy, Iy * Iy]
+    if It is not None:
+        products += [Ix * It, Iy * It]
+    windowed = getWindowedProducts(np.stack(products), sigma, window)
+
+    M11, M12, M22 = windowed[:3]
+    M = np.stack((M11, M12, M12, M22), axis=-1).reshape(M11.shape[0], M11.shape[1], 2, 2)
+
+    q = None
+    if It is not None:
+        q = np.stack((windowed[3], windowed[4]), axis=-1)
+
+    return M, q
+
+def getEigenvalues(M):
+    # compute the eigenvalues of every symmetric 2x2 block in closed form
+    # Input:
+    # M: numpy.ndarray (structure tensor) of shape (H, W, 2, 2)
+    # Output:
+    # lambda_min: numpy.ndarray (smaller eigenvalue) of shape (H, W)
+    # lambda_max: numpy.ndarray (larger eigenvalue) of shape (H, W)
+
+    a, b, d = M[..., 0, 0], M[..., 0, 1], M[..., 1, 1]
+    mean = (a + d) / 2
+    radius = np.sqrt(((a - d) / 2) ** 2 + b ** 2)
+    return mean - radius, mean + radius
+
+def getPyramid(I, levels):
+    # build a Gaussian image pyramid
+    # Input:
+    # I: numpy.ndarray (image) of shape (H, W)
+    # levels: int (number of levels, 1 returns only the image itself)
+    # Output:
+    # pyramid: list of numpy.ndarray, finest level first, each level half the size of the previous one
+
+    pyramid = [I]
+    for _ in range(levels - 1):
+        pyramid.append(cv2.pyrDown(np.asarray(pyramid[-1], dtype=np.float32)))
+    return pyramid
+
+def warpImage(I, flow):
+    # warp an image backwards along a flow field
+    # Input:
+    # I: numpy.ndarray (image) of shape (H, W)
+    # flow: numpy.ndarray (flow, horizontal and vertical component) of shape (H, W, 2)
+    # Output:
+    # I_warped: numpy.ndarray (float32 image with I_warped(x) = I(x + flow(x))) of shape (H, W)
+
+    rows, cols = np.indices(I.shape[:2], dtype=np.float32)
+    map_x = cols + flow[..., 0].astype(np.float32)
+    map_y = rows + flow[..., 1].astype(np.float32)
+    return cv2.remap(np.asarray(I, dtype=np.float32), map_x, map_y, cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
@@ -3,6 +3,14 @@ from .test_flow_angular import test_flow_angular
 from .test_flow_computation_time import test_flow_computation_time
 from .test_flow_endpoint import test_flow_endpoint
 from .test_gradient import  test_gradients
+from .test_temporal_derivative import test_getTemporalPartialDerivative
 from .test_get_m import test_getM
 from .test_gaussian_kernel import test_getGaussiankernel
-from .test_harris_corner import test_getHarrisCorners
\ No newline at end of file
+from .test_harris_corner import test_getHarrisCorners
+from .test_structure_tensor import test_getStructureTensor
+from .test_get_flow import test_getFlow
+from .test_track_points import test_trackPoints
+from .test_flow_tracker import test_FlowTracker
+from .test_tiled_flow import test_compute_flow_tiled
+from .test_corner_selection import test_cornerSelection
+from .test_feature_context import test_FeatureContext
@@ -0,0 +1,124 @@
+import numpy as np
+from .base_tests import UnitTest, CompositeTest, test_results_to_score
+from exercise_code.getHarrisCorners import getHarrisCorners
+
+
+def random_tensor(H=40, W=50, seed=0):
+    # random symmetric positive semi-definite structure tensors
+    rng = np.random.default_rng(seed)
+    A = rng.standard_normal((H, W, 2, 2))
+    return A @ np.swapaxes(A, -1, -2)
+
+
+class CornerNMSLoopTest(UnitTest):
+    def __init__(self) -> None:
+        self.M = random_tensor()
+        self.kappa = 0.05
+        self.theta = 0.1
+
+    def test(self):
+        score, points = getHarrisCorners(self.M, self.kappa, self.theta)
+
+        # reference: pixel above threshold and strictly above its four adjacent pixels
+        H, W = score.shape
+        expected = []
+        for i in range(H):
+            for j in range(W):
+                neighbours = [score[y, x] for y, x in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)) if 0 <= y < H and 0 <= x < W]
+                if score[i, j] > self.theta and all(score[i, j] > n for n in neighbours):
+                    expected.append((i, j))
+
+        self.output = (len(points), len(expected))
+        return {tuple(p) for p in points} == set(expected) and len(points) == len(expected)
+
+    def define_success_message(self):
+        return "CornerNMSLoopTest passed: vectorized non-maximum suppression matches the loop."
+
+    def define_failure_message(self):
+        return "CornerNMSLoopTest failed: found {} corners, expected {}.".format(*self.output)
+
+
+class CornerTopKTest(UnitTest):
+    def __init__(self) -> None:
+        self.M = random_tensor(seed=1)
+        self.kappa = 0.05
+        self.theta = 0.0
+        self.k = 7
+
+    def test(self):
+        score, all_points = getHarrisCorners(self.M, self.kappa, self.theta)
+        _, points = getHarrisCorners(self.M, self.kappa, self.theta, max_corners=self.k)
+
+        all_values = score[all_points[:, 0], all_points[:, 1]]
+        expected = np.sort(all_values)[::-1][:self.k]
+        values = score[points[:, 0], points[:, 1]]
+        self.output = (values, expected)
+        return points.shape == (self.k, 2) and np.array_equal(values, expected)
+
+    def define_success_message(self):
+        return "CornerTopKTest passed: the strongest corners are returned in descending order."
+
+    def define_failure_message(self):
+        return "CornerTopKTest failed: got scores {}, expected {}.".format(*self.output)
+
+
+class CornerGridTest(UnitTest):
+    def __init__(self) -> None:
+        self.M = random_tensor(seed=2)
+        self.kappa = 0.05
+        self.theta = 0.0
+        self.grid = (2, 5)
+        self.per_cell = 2
+
+    def test(self):
+        score, all_points = getHarrisCorners(self.M, self.kappa, self.theta)
+        _, points = getHarrisCorners(self.M, self.kappa, self.theta, grid=self.grid, per_cell=self.per_cell)
+
+        # the strongest per_cell corners of every 20x10 cell
+        H, W = score.shape
+        expected = set()
+        for r in range(self.grid[0]):
+            for c in range(self.grid[1]):
+                inside = ((all_points[:, 0] * self.grid[0] // H == r) & (all_points[:, 1] * self.grid[1] // W == c))
+                cell_points = all_points[inside]
+                order = np.argsort(-score[cell_points[:, 0], cell_points[:, 1]])
+                expected |= {tuple(p) for p in cell_points[order[:self.per_cell]]}
+
+        self.output = (len(points), len(expected))
+        return {tuple(p) for p in points} == expected and len(points) == len(expected)
+
+    def define_success_message(self):
+        return "CornerGridTest passed: every grid cell keeps its strongest corners."
+
+    def define_failure_message(self):
+        return "CornerGridTest failed: selected {} corners, expected {}.".format(*self.output)
+
+
+class ShiTomasiScoreTest(UnitTest):
+    def __init__(self) -> None:
+        self.M = random_tensor(seed=3)
+
+    def test(self):
+        score, _ = getHarrisCorners(self.M, 0.05, 0.0, method='shi-tomasi')
+        return np.allclose(score, np.linalg.eigvalsh(self.M)[..., 0])
+
+    def define_success_message(self):
+        return "ShiTomasiScoreTest passed: score is the smaller eigenvalue of M."
+
+    def define_failure_message(self):
+        return "ShiTomasiScoreTest failed: score differs from the smaller eigenvalue of M."
+
+
+class CornerSelectionTests(CompositeTest):
+    def define_tests(self):
+        return [
+            CornerNMSLoopTest(),
+            CornerTopKTest(),
+            CornerGridTest(),
+            ShiTomasiScoreTest()
+        ]
+
+
+def test_cornerSelection():
+    test = CornerSelectionTests()
+    return test_results_to_score(test())
@@ -0,0 +1,101 @@
+import numpy as np
+from .base_tests import UnitTest, CompositeTest, test_results_to_score
+from .utils import make_sequence, count_calls
+import exercise_code.featureContext as featureContext
+from exercise_code.featureContext import FeatureContext
+from exercise_code.flowTracker import FlowTracker
+from exercise_code.getHarrisCorners import getHarrisCorners
+from exercise_code.utils import getSmoothedImage, getCentralDifferences, getStructureTensor
+
+
+class FeatureContextResultsTest(UnitTest):
+    def __init__(self) -> None:
+        self.frames = make_sequence(3, 50, 70)
+        self.kappa = 0.05
+        self.theta = 1e-9
+
+    def test(self):
+        context = FeatureContext()
+        score, points = context.corners(0, self.kappa, self.theta, frame=self.frames[0])
+        v, v_points = context.flow(0, 1, points, frame2=self.frames[1])
+
+        Ix, Iy = getCentralDifferences(getSmoothedImage(self.frames[0]))
+        M, _ = getStructureTensor(Ix, Iy)
+        expected_score, expected_points = getHarrisCorners(M, self.kappa, self.theta)
+
+        tracker = FlowTracker()
+        expected_v = list(tracker.track(self.frames[:2]))[0]
+
+        self.output = np.abs(v - expected_v).max()
+        return (np.array_equal(score, expected_score) and np.array_equal(points, expected_points)
+                and np.allclose(v, expected_v, atol=1e-6)
+                and np.array_equal(v_points, v[points[:, 0], points[:, 1]]))
+
+    def define_success_message(self):
+        return "FeatureContextResultsTest passed: shared features give the same corners and flow."
+
+    def define_failure_message(self):
+        return "FeatureContextResultsTest failed: max deviation of the flow {}.".format(self.output)
+
+
+class FeatureContextMemoTest(UnitTest):
+    def __init__(self) -> None:
+        self.frames = make_sequence(3, 50, 70)
+
+    def test(self):
+        # count the blurs by wrapping the function the context uses
+        with count_calls(featureContext, 'getSmoothedImage') as calls:
+            context = FeatureContext()
+            M = context.features(0, self.frames[0]).structureTensor()
+            context.corners(0, 0.05, 1e-9)
+            context.flow(0, 1, frame2=self.frames[1])
+            context.corners(1, 0.05, 1e-9)
+            context.flow(1, 2, frame2=self.frames[2])
+            same_M = context.features(0).structureTensor() is M
+        self.output = len(calls)
+        return same_M and len(calls) == len(self.frames)
+
+    def define_success_message(self):
+        return "FeatureContextMemoTest passed: each frame is processed once for detection and tracking."
+
+    def define_failure_message(self):
+        return "FeatureContextMemoTest failed: {} blurs for {} frames.".format(self.output, len(self.frames))
+
+
+class FeatureContextLRUTest(UnitTest):
+    def __init__(self) -> None:
+        self.frames = make_sequence(4, 50, 70)
+
+    def test(self):
+        context = FeatureContext(max_frames=2)
+        for i, frame in enumerate(self.frames):
+            context.features(i, frame)
+        context.features(2)
+        try:
+            context.features(0)
+            return False
+        except KeyError:
+            pass
+        # frame 2 was used last, so adding a new frame drops frame 3
+        context.features(4, self.frames[0])
+        return [key[0] for key in context.frames] == [2, 4]
+
+    def define_success_message(self):
+        return "FeatureContextLRUTest passed: the least recently used frames are dropped."
+
+    def define_failure_message(self):
+        return "FeatureContextLRUTest failed: cache does not follow least recently used order."
+
+
+class FeatureContextTests(CompositeTest):
+    def define_tests(self):
+        return [
+            FeatureContextResultsTest(),
+            FeatureContextMemoTest(),
+            FeatureContextLRUTest()
+        ]
+
+
+def test_FeatureContext():
+    test = FeatureContextTests()
+    return test_results_to_score(test())
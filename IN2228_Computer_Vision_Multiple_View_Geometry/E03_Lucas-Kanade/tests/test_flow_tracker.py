@@ -0,0 +1,57 @@
+import numpy as np
+from .base_tests import UnitTest, CompositeTest, test_results_to_score
+from .utils import make_sequence, count_calls
+import exercise_code.flowTracker as flowTracker
+from exercise_code.flowTracker import FlowTracker
+from exercise_code.getFlow import compute_flow
+
+
+class FlowTrackerPairsTest(UnitTest):
+    def __init__(self) -> None:
+        self.frames = make_sequence(4, 60, 80)
+
+    def test(self):
+        flows = list(FlowTracker().track(iter(self.frames)))
+        expected = [compute_flow(im1, im2) for im1, im2 in zip(self.frames, self.frames[1:])]
+        self.output = max(np.abs(f - e).max() for f, e in zip(flows, expected))
+        return len(flows) == len(expected) and all(np.array_equal(f, e) for f, e in zip(flows, expected))
+
+    def define_success_message(self):
+        return "FlowTrackerPairsTest passed: streamed flow matches compute_flow on every pair."
+
+    def define_failure_message(self):
+        return "FlowTrackerPairsTest failed: max deviation from compute_flow {}.".format(self.output)
+
+
+class FlowTrackerBlurCountTest(UnitTest):
+    def __init__(self) -> None:
+        self.frames = make_sequence(5, 60, 80)
+
+    def test(self):
+        # count the blurs by wrapping the function the tracker uses
+        with count_calls(flowTracker, 'getSmoothedImage') as calls:
+            tracker = FlowTracker()
+            first = tracker.update(self.frames[0])
+            for flow in tracker.track(self.frames[1:]):
+                pass
+        self.output = len(calls)
+        return first is None and len(calls) == len(self.frames)
+
+    def define_success_message(self):
+        return "FlowTrackerBlurCountTest passed: every frame is blurred exactly once."
+
+    def define_failure_message(self):
+        return "FlowTrackerBlurCountTest failed: {} blurs for {} frames.".format(self.output, len(self.frames))
+
+
+class FlowTrackerTests(CompositeTest):
+    def define_tests(self):
+        return [
+            FlowTrackerPairsTest(),
+            FlowTrackerBlurCountTest()
+        ]
+
+
+def test_FlowTracker():
+    test = FlowTrackerTests()
+    return test_results_to_score(test())
@@ -0,0 +1,149 @@
+import numpy as np
+import cv2
+from .base_tests import UnitTest, CompositeTest, test_results_to_score
+from exercise_code.getFlow import getFlow, compute_flow
+from exercise_code.utils import getEigenvalues, getGradients, getTemporalPartialDerivative, getStructureTensor
+from exercise_code.trackPoints import trackPoints
+from exercise_code.flowTracker import FlowTracker
+from exercise_code.tiledFlow import compute_flow_tiled
+
+
+class FlowSolveTest(UnitTest):
+    def __init__(self) -> None:
+        # random symmetric positive definite blocks, compared against a per-pixel linear solve
+        rng = np.random.default_rng(0)
+        self.H, self.W = 6, 7
+        A = rng.standard_normal((self.H, self.W, 2, 2))
+        self.M = A @ np.swapaxes(A, -1, -2) + 0.1 * np.eye(2)
+        self.q = rng.standard_normal((self.H, self.W, 2))
+        x, y = np.meshgrid(np.arange(self.H), np.arange(self.W))
+        self.points = np.array([x.flatten(), y.flatten()]).T
+
+    def test(self):
+        v, v_points = getFlow(self.M, self.q, self.points)
+        expected = -np.linalg.solve(self.M, self.q[..., None])[..., 0]
+        self.output = np.abs(v - expected).max()
+        return (np.allclose(v, expected, atol=1e-8)
+                and np.allclose(v_points, expected[self.points[:, 0], self.points[:, 1]]))
+
+    def define_success_message(self):
+        return "FlowSolveTest passed: closed-form solve matches np.linalg.solve."
+
+    def define_failure_message(self):
+        return "FlowSolveTest failed: max deviation {}.".format(self.output)
+
+
+class FlowSingularTest(UnitTest):
+    def __init__(self) -> None:
+        # a flat window (M = 0) and an edge (rank one M) are singular
+        self.M = np.zeros((1, 3, 2, 2))
+        self.M[0, 1] = [[1.0, 0.0], [0.0, 0.0]]
+        self.M[0, 2] = [[2.0, 0.0], [0.0, 1.0]]
+        self.q = np.ones((1, 3, 2))
+        self.points = np.array([[0, 0], [0, 1], [0, 2]])
+
+    def test(self):
+        v, v_points, valid = getFlow(self.M, self.q, self.points, min_eig=1e-6, return_mask=True)
+        self.output = (v, valid)
+        return (np.all(np.isfinite(v))
+                and np.array_equal(valid, [[False, False, True]])
+                and np.allclose(v[0, :2], 0.0)
+                and np.allclose(v[0, 2], [-0.5, -1.0]))
+
+    def define_success_message(self):
+        return "FlowSingularTest passed: ill-conditioned pixels get zero flow and are masked."
+
+    def define_failure_message(self):
+        return "FlowSingularTest failed: got flow {} and mask {}.".format(*self.output)
+
+
+class FlowApertureTest(UnitTest):
+    def __init__(self) -> None:
+        # oblique ramp: the gradient has the same direction everywhere, so M has rank one
+        # away from the border and only round-off keeps its smaller eigenvalue above zero
+        y, x = np.mgrid[0:160, 0:160].astype(np.float32)
+        self.im1 = 1.3 * x + 0.4 * y
+        self.im2 = self.im1 - 1.3
+        self.interior = np.s_[40:-40, 40:-40]
+        self.points = np.array([[50, 50], [80, 100], [110, 70]])
+
+    def test(self):
+        Ix, Iy = getGradients(self.im1)
+        It = getTemporalPartialDerivative(self.im1, self.im2)
+        M, q = getStructureTensor(Ix, Iy, It)
+        v, _, valid = getFlow(M, q, self.points, return_mask=True)
+        v_points, valid_points = trackPoints(self.im1, self.im2, self.points, return_mask=True)
+        flows = [v, compute_flow(self.im1, self.im2), list(FlowTracker().track([self.im1, self.im2]))[0],
+                 compute_flow_tiled(self.im1, self.im2, tile_size=64, workers=1)]
+        self.output = valid[self.interior].mean()
+        return (not valid[self.interior].any() and not valid_points.any()
+                and np.all(v_points == 0)
+                and all(np.all(np.isfinite(flow)) and np.all(flow[self.interior] == 0) for flow in flows))
+
+    def define_success_message(self):
+        return "FlowApertureTest passed: rank-deficient windows are masked out."
+
+    def define_failure_message(self):
+        return "FlowApertureTest failed: {:.1%} of the rank-deficient windows are marked valid.".format(self.output)
+
+
+class EigenvalueTest(UnitTest):
+    def __init__(self) -> None:
+        rng = np.random.default_rng(1)
+        A = rng.standard_normal((5, 4, 2, 2))
+        self.M = A @ np.swapaxes(A, -1, -2)
+
+    def test(self):
+        lambda_min, lambda_max = getEigenvalues(self.M)
+        expected = np.linalg.eigvalsh(self.M)
+        return np.allclose(lambda_min, expected[..., 0]) and np.allclose(lambda_max, expected[..., 1])
+
+    def define_success_message(self):
+        return "EigenvalueTest passed: closed-form eigenvalues match np.linalg.eigvalsh."
+
+    def define_failure_message(self):
+        return "EigenvalueTest failed: closed-form eigenvalues differ from np.linalg.eigvalsh."
+
+
+class PyramidalFlowTest(UnitTest):
+    def __init__(self) -> None:
+        # smooth random texture, the second image is the first one shifted by several pixels
+        rng = np.random.default_rng(0)
+        texture = cv2.GaussianBlur(rng.uniform(0, 255, (160, 160)).astype(np.float32), (0, 0), 3)
+        texture = (texture - texture.min()) / (texture.max() - texture.min()) * 255
+        self.shift = np.array([7, -5])
+        dx, dy = self.shift
+        self.im1 = texture[20:140, 20:140]
+        self.im2 = texture[20 - dy:140 - dy, 20 - dx:140 - dx]
+
+    def test(self):
+        error_single = self.error(compute_flow(self.im1, self.im2))
+        error_pyramid = self.error(compute_flow(self.im1, self.im2, levels=3, iterations=3))
+        self.output = (error_single, error_pyramid)
+        return error_pyramid < 0.5 and error_pyramid < error_single
+
+    def error(self, flow):
+        # mean endpoint error away from the image border
+        return np.linalg.norm(flow[30:-30, 30:-30] - self.shift, axis=-1).mean()
+
+    def define_success_message(self):
+        return "PyramidalFlowTest passed: coarse-to-fine flow recovers a large shift."
+
+    def define_failure_message(self):
+        return "PyramidalFlowTest failed: endpoint error {:.2f} at a single scale, {:.2f} with the pyramid.".format(*self.output)
+
+
+class FlowTests(CompositeTest):
+    def define_tests(self):
+        return [
+            FlowSolveTest(),
+            FlowSingularTest(),
+            FlowApertureTest(),
+            EigenvalueTest(),
+            PyramidalFlowTest()
+        ]
+
+
+def test_getFlow():
+    test = FlowTests()
+    return test_results_to_score(test())
@@ -0,0 +1,116 @@
+import numpy as np
+from scipy.signal import convolve2d as conv2
+from .base_tests import UnitTest, CompositeTest, test_results_to_score
+from exercise_code.utils import getM, getq, getStructureTensor, getGaussiankernel, getGaussiankernel1d
+
+
+class StructureTensorConv2Test(UnitTest):
+    def __init__(self) -> None:
+        # random gradients, compared against a direct 2D convolution with the full kernel
+        rng = np.random.default_rng(0)
+        self.H, self.W = 31, 40
+        self.Ix = rng.standard_normal((self.H, self.W)).astype(np.float32)
+        self.Iy = rng.standard_normal((self.H, self.W)).astype(np.float32)
+        self.It = rng.standard_normal((self.H, self.W)).astype(np.float32)
+        self.sigma = 3
+
+    def test(self):
+        M, q = getStructureTensor(self.Ix, self.Iy, self.It, sigma=self.sigma)
+
+        G = getGaussiankernel(self.sigma)
+        window = lambda P: conv2(P.astype(np.float64), G, 'same', boundary='symm')
+        expected_M = np.stack((window(self.Ix * self.Ix), window(self.Ix * self.Iy),
+                               window(self.Ix * self.Iy), window(self.Iy * self.Iy)), axis=-1).reshape(self.H, self.W, 2, 2)
+        expected_q = np.stack((window(self.Ix * self.It), window(self.Iy * self.It)), axis=-1)
+
+        self.output = (np.abs(M - expected_M).max(), np.abs(q - expected_q).max())
+        return np.allclose(M, expected_M, atol=1e-5) and np.allclose(q, expected_q, atol=1e-5)
+
+    def define_success_message(self):
+        return "StructureTensorConv2Test passed: fused separable weighting matches the 2D convolution."
+
+    def define_failure_message(self):
+        return "StructureTensorConv2Test failed: max deviation of M {}, of q {}.".format(*self.output)
+
+
+class StructureTensorConsistencyTest(UnitTest):
+    def __init__(self) -> None:
+        rng = np.random.default_rng(1)
+        self.Ix = rng.standard_normal((16, 21)).astype(np.float32)
+        self.Iy = rng.standard_normal((16, 21)).astype(np.float32)
+        self.It = rng.standard_normal((16, 21)).astype(np.float32)
+        self.sigma = 2
+
+    def test(self):
+        M, q = getStructureTensor(self.Ix, self.Iy, self.It, sigma=self.sigma)
+        M_only, q_none = getStructureTensor(self.Ix, self.Iy, sigma=self.sigma)
+        return (q_none is None
+                and np.allclose(M, getM(self.Ix, self.Iy, sigma=self.sigma), atol=1e-6)
+                and np.allclose(M, M_only, atol=1e-6)
+                and np.allclose(q, getq(self.It, self.Ix, self.Iy, sigma=self.sigma), atol=1e-6))
+
+    def define_success_message(self):
+        return "StructureTensorConsistencyTest passed: fused result agrees with getM and getq."
+
+    def define_failure_message(self):
+        return "StructureTensorConsistencyTest failed: fused result differs from getM/getq."
+
+
+class BoxWindowConv2Test(UnitTest):
+    def __init__(self) -> None:
+        # box averages must match a direct 2D convolution with a normalized box kernel
+        rng = np.random.default_rng(2)
+        self.H, self.W = 23, 37
+        self.Ix = rng.standard_normal((self.H, self.W)).astype(np.float32)
+        self.Iy = rng.standard_normal((self.H, self.W)).astype(np.float32)
+        self.It = rng.standard_normal((self.H, self.W)).astype(np.float32)
+        self.sigma = 2
+
+    def test(self):
+        M, q = getStructureTensor(self.Ix, self.Iy, self.It, sigma=self.sigma, window='box')
+
+        k = 4 * self.sigma + 1
+        B = np.ones((k, k)) / (k * k)
+        window = lambda P: conv2(P.astype(np.float64), B, 'same', boundary='symm')
+        expected_M12 = window(self.Ix * self.Iy)
+        expected_q2 = window(self.Iy * self.It)
+
+        self.output = (np.abs(M[..., 0, 1] - expected_M12).max(), np.abs(q[..., 1] - expected_q2).max())
+        return (np.allclose(M[..., 0, 1], expected_M12, atol=1e-5)
+                and np.allclose(M[..., 1, 0], expected_M12, atol=1e-5)
+                and np.allclose(M[..., 0, 0], window(self.Ix * self.Ix), atol=1e-5)
+                and np.allclose(q[..., 1], expected_q2, atol=1e-5))
+
+    def define_success_message(self):
+        return "BoxWindowConv2Test passed: summed-area box window matches the 2D convolution."
+
+    def define_failure_message(self):
+        return "BoxWindowConv2Test failed: max deviation of M12 {}, of q2 {}.".format(*self.output)
+
+
+class GaussianKernelMemoTest(UnitTest):
+    def test(self):
+        g = getGaussiankernel1d(2)
+        # the kernel is computed once per sigma and must not be modifiable by callers
+        return g is getGaussiankernel1d(2) and not g.flags.writeable and np.isclose(g.sum(), 1.0)
+
+    def define_success_message(self):
+        return "GaussianKernelMemoTest passed: 1D kernel is memoized and read-only."
+
+    def define_failure_message(self):
+        return "GaussianKernelMemoTest failed: 1D kernel is recomputed or writeable."
+
+
+class StructureTensorTests(CompositeTest):
+    def define_tests(self):
+        return [
+            StructureTensorConv2Test(),
+            StructureTensorConsistencyTest(),
+            BoxWindowConv2Test(),
+            GaussianKernelMemoTest()
+        ]
+
+
+def test_getStructureTensor():
+    test = StructureTensorTests()
+    return test_results_to_score(test())
@@ -0,0 +1,64 @@
+import numpy as np
+import cv2
+from .base_tests import UnitTest, CompositeTest, test_results_to_score
+from exercise_code.utils import getTemporalPartialDerivative
+from .utils import make_frames
+
+
+class TemporalDerivativeImpulse(UnitTest):
+    def __init__(self) -> None:
+        # a single bright pixel appears, It is the blur kernel scaled to [0, 1]
+        self.sigma = 2
+        self.I1 = np.zeros((21, 21), dtype=np.float32)
+        self.I2 = self.I1.copy()
+        self.I2[10, 10] = 255.0
+        k = int(np.ceil(4 * self.sigma + 1))
+        g = cv2.getGaussianKernel(k, self.sigma)
+        self.expected = np.zeros((21, 21))
+        self.expected[10 - k // 2:10 + k // 2 + 1, 10 - k // 2:10 + k // 2 + 1] = g @ g.T
+
+    def test(self):
+        It = getTemporalPartialDerivative(self.I1, self.I2, self.sigma)
+        self.output = np.abs(It - self.expected).max()
+        # the blur is isotropic with the given sigma in both directions
+        return np.allclose(It, self.expected, atol=1e-7) and np.allclose(It, It.T, atol=1e-7)
+
+    def define_success_message(self):
+        return "TemporalDerivativeImpulse passed: both images are blurred with sigma in x and y."
+
+    def define_failure_message(self):
+        return "TemporalDerivativeImpulse failed: max deviation from the Gaussian kernel {}.".format(self.output)
+
+
+class TemporalDerivativeSharedBlur(UnitTest):
+    def __init__(self) -> None:
+        self.I1, self.I2 = make_frames(40, 50)
+
+    def test(self):
+        # It is the difference of the frames blurred like in getGradients, without blur the plain difference
+        It = getTemporalPartialDerivative(self.I1, self.I2)
+        blur = lambda I: cv2.GaussianBlur(I.astype(np.float32) / np.float32(255.0), (9, 9), sigmaX=2, sigmaY=2,
+                                          borderType=cv2.BORDER_DEFAULT)
+        It_plain = getTemporalPartialDerivative(self.I1, self.I2, sigma=0)
+        self.output = np.abs(It - (blur(self.I2) - blur(self.I1))).max()
+        return (It.dtype == np.float32 and np.array_equal(It, blur(self.I2) - blur(self.I1))
+                and np.allclose(It_plain, (self.I2.astype(np.float64) - self.I1) / 255.0, atol=1e-7))
+
+    def define_success_message(self):
+        return "TemporalDerivativeSharedBlur passed: It is the difference of the blurred frames."
+
+    def define_failure_message(self):
+        return "TemporalDerivativeSharedBlur failed: max deviation {}.".format(self.output)
+
+
+class TemporalDerivativeTests(CompositeTest):
+    def define_tests(self):
+        return [
+            TemporalDerivativeImpulse(),
+            TemporalDerivativeSharedBlur()
+        ]
+
+
+def test_getTemporalPartialDerivative():
+    test = TemporalDerivativeTests()
+    return test_results_to_score(test())
@@ -0,0 +1,55 @@
+import numpy as np
+from .base_tests import UnitTest, CompositeTest, test_results_to_score
+from .utils import make_frames
+from exercise_code.getFlow import compute_flow
+from exercise_code.tiledFlow import compute_flow_tiled
+
+
+class TiledFlowExactTest(UnitTest):
+    def __init__(self) -> None:
+        # odd sizes leave partial tiles
+        self.im1, self.im2 = make_frames(123, 157)
+
+    def test(self):
+        expected = compute_flow(self.im1, self.im2)
+        serial = compute_flow_tiled(self.im1, self.im2, tile_size=40, workers=1)
+        parallel = compute_flow_tiled(self.im1, self.im2, tile_size=40, workers=2)
+        self.output = (np.abs(serial - expected).max(), np.abs(parallel - expected).max())
+        return np.array_equal(serial, expected) and np.array_equal(parallel, expected)
+
+    def define_success_message(self):
+        return "TiledFlowExactTest passed: tiled flow is identical to the untiled flow."
+
+    def define_failure_message(self):
+        return "TiledFlowExactTest failed: max deviation serial {}, parallel {}.".format(*self.output)
+
+
+class TiledFlowBoxTest(UnitTest):
+    def __init__(self) -> None:
+        # odd sizes leave partial tiles
+        self.im1, self.im2 = make_frames(123, 157)
+
+    def test(self):
+        expected = compute_flow(self.im1, self.im2, window='box')
+        flow = compute_flow_tiled(self.im1, self.im2, tile_size=50, workers=1, window='box')
+        self.output = np.abs(flow - expected).max()
+        return np.allclose(flow, expected, atol=1e-5)
+
+    def define_success_message(self):
+        return "TiledFlowBoxTest passed: tiled box-window flow matches the untiled flow."
+
+    def define_failure_message(self):
+        return "TiledFlowBoxTest failed: max deviation {}.".format(self.output)
+
+
+class TiledFlowTests(CompositeTest):
+    def define_tests(self):
+        return [
+            TiledFlowExactTest(),
+            TiledFlowBoxTest()
+        ]
+
+
+def test_compute_flow_tiled():
+    test = TiledFlowTests()
+    return test_results_to_score(test())
@@ -0,0 +1,84 @@
+import numpy as np
+from .base_tests import UnitTest, CompositeTest, test_results_to_score
+from .utils import make_frames
+from exercise_code.utils import getGradients, getTemporalPartialDerivative, getStructureTensor
+from exercise_code.getFlow import getFlow
+from exercise_code.trackPoints import trackPoints
+
+
+class TrackPointsDenseTest(UnitTest):
+    def __init__(self) -> None:
+        self.im1, self.im2 = make_frames(90, 120, shift=(1, -1), margin=5, quantize=False)
+        H, W = self.im1.shape
+        rng = np.random.default_rng(1)
+        interior = np.stack((rng.integers(0, H, 40), rng.integers(0, W, 40)), axis=1)
+        # points close to the image border exercise the reflected windows
+        border = np.array([[0, 0], [H - 1, W - 1], [2, 60], [45, 1], [H - 3, 7], [10, W - 2]])
+        self.points = np.vstack((interior, border))
+
+    def test(self):
+        It = getTemporalPartialDerivative(self.im1, self.im2)
+        Ix, Iy = getGradients(self.im1)
+        M, q = getStructureTensor(Ix, Iy, It)
+        _, expected = getFlow(M, q, self.points)
+
+        v_points = trackPoints(self.im1, self.im2, self.points)
+        self.output = np.abs(v_points - expected).max()
+        return v_points.shape == expected.shape and np.allclose(v_points, expected, atol=1e-4)
+
+    def define_success_message(self):
+        return "TrackPointsDenseTest passed: sparse flow matches the dense flow at the points."
+
+    def define_failure_message(self):
+        return "TrackPointsDenseTest failed: max deviation from the dense flow {}.".format(self.output)
+
+
+class TrackPointsFlatTest(UnitTest):
+    def __init__(self) -> None:
+        # a constant image has no gradients, every point is ill-conditioned
+        self.im = np.full((30, 40), 100, dtype=np.uint8)
+        self.points = np.array([[5, 5], [15, 20], [29, 39]])
+
+    def test(self):
+        v_points, valid = trackPoints(self.im, self.im, self.points, return_mask=True)
+        self.output = (v_points, valid)
+        return np.all(v_points == 0) and not np.any(valid)
+
+    def define_success_message(self):
+        return "TrackPointsFlatTest passed: points without texture get zero flow and are masked."
+
+    def define_failure_message(self):
+        return "TrackPointsFlatTest failed: got flow {} and mask {}.".format(*self.output)
+
+
+class TrackPointsEmptyTest(UnitTest):
+    def __init__(self) -> None:
+        # a textureless frame has no corners, so there is nothing to track
+        self.im = np.full((30, 40), 100, dtype=np.uint8)
+        self.points = np.zeros((0, 2), dtype=int)
+
+    def test(self):
+        v_points, valid = trackPoints(self.im, self.im, self.points, return_mask=True)
+        self.output = (v_points.shape, valid.shape)
+        return (v_points.shape == (0, 2) and valid.shape == (0,) and valid.dtype == bool
+                and trackPoints(self.im, self.im, self.points).shape == (0, 2))
+
+    def define_success_message(self):
+        return "TrackPointsEmptyTest passed: no points give an empty flow and mask."
+
+    def define_failure_message(self):
+        return "TrackPointsEmptyTest failed: got flow of shape {} and mask of shape {}.".format(*self.output)
+
+
+class TrackPointsTests(CompositeTest):
+    def define_tests(self):
+        return [
+            TrackPointsDenseTest(),
+            TrackPointsFlatTest(),
+            TrackPointsEmptyTest()
+        ]
+
+
+def test_trackPoints():
+    test = TrackPointsTests()
+    return test_results_to_score(test())
@@ -0,0 +1,43 @@
+import contextlib
+import numpy as np
+import cv2
+
+
+def make_texture(H, W, seed=0, sigma=2):
+    # smooth random float32 texture with values in [0, 255]
+    rng = np.random.default_rng(seed)
+    return cv2.GaussianBlur(rng.uniform(0, 255, (H, W)).astype(np.float32), (0, 0), sigma)
+
+
+def make_frames(H, W, shift=(1, 0), margin=1, quantize=True):
+    # texture and a copy shifted by a small displacement (dx, dy) no larger than margin
+    texture = make_texture(H + 2 * margin, W + 2 * margin)
+    if quantize:
+        texture = np.round(texture).astype(np.uint8)
+    dx, dy = shift
+    im1 = texture[margin:H + margin, margin:W + margin]
+    im2 = texture[margin - dy:H + margin - dy, margin - dx:W + margin - dx]
+    return im1, im2
+
+
+def make_sequence(num_frames, H, W):
+    # uint8 texture moving by one pixel to the right per frame
+    texture = np.round(make_texture(H, W + num_frames)).astype(np.uint8)
+    return [texture[:, num_frames - i:num_frames - i + W] for i in range(num_frames)]
+
+
+@contextlib.contextmanager
+def count_calls(module, name):
+    # temporarily wrap module.name and collect one entry per call
+    calls = []
+    original = getattr(module, name)
+
+    def counted(*args, **kwargs):
+        calls.append(1)
+        return original(*args, **kwargs)
+
+    setattr(module, name, counted)
+    try:
+        yield calls
+    finally:
+        setattr(module, name, original)